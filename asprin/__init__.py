@@ -28,3 +28,11 @@ __email__ = 'javier@cs.uni-potsdam.de'
 __license__ = 'MIT'
 __version__ = '3.1.2beta'
 __url__ = 'https://github.com/potassco/asprin'
+
+def solve(files=(), strings=(), clingo_options=(), **options):
+    from .src.main import api
+    return api.solve(files, strings, clingo_options, **options)
+
+def solve_async(files=(), strings=(), clingo_options=(), **options):
+    from .src.main import api
+    return api.solve_async(files, strings, clingo_options, **options)
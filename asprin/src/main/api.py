@@ -0,0 +1,316 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Python API
+#
+# Example:
+#   import asprin
+#   with asprin.solve(["example1.lp"], models=0) as handle:
+#       for model in handle:
+#           print(model.number, model.optimality, model.shown)
+#   print(handle.statistics)
+#
+# solve(files, strings, clingo_options, **options) returns a SolveHandle,
+# where <files> and <strings> are lists of files and programs,
+# <clingo_options> is a list of clingo command line options, and
+# <options> are the long options of asprin (see run_keywords at main.py).
+# Option quiet is 1 by default: only the models whose optimality is known are
+# yielded. With quiet=0, every model is also yielded when it is found, with
+# optimality None, and with quiet=2 the models have no atoms.
+#
+# The handle runs asprin in another thread, that computes at most one model
+# more than the ones already yielded. Closing the handle (or leaving the with
+# statement, or the loop) interrupts the search. The handle is closed at the
+# end, and then handle.statistics has the statistics as a dictionary (see
+# Printer.get_stats at utils/printer.py).
+#
+# solve_async() returns an AsyncSolveHandle, that works in the same way with
+# 'async with' and 'async for'. Cancelling the task that iterates over the
+# handle (for example, with asyncio.timeout) interrupts the search.
+#
+
+import threading
+import queue
+import asyncio
+from . import main
+from ..solver import solver
+from ..utils import printer
+
+END            = None
+INTERRUPT_TIME = 0.1
+ERROR_EXIT     = "asprin exited with code {}"
+
+# parsing uses the class variables of the parsers, and utils.underscores
+lock = threading.Lock()
+
+
+class Model:
+
+    def __init__(self, number, step):
+        self.number     = number # as in 'Answer: <number>'
+        self.step       = step
+        self.shown      = []     # shown symbols
+        self.holds      = []     # holds symbols
+        self.optimality = None   # OPTIMUM FOUND, OPTIMUM FOUND *, ...
+
+    def copy(self):
+        model = Model(self.number, self.step)
+        model.shown, model.holds = self.shown, self.holds
+        return model
+
+    def __str__(self):
+        return " ".join(str(x) for x in self.shown)
+
+    def __repr__(self):
+        return "Model({}, {}, {})".format(
+            self.number, repr(self.optimality), str(self)
+        )
+
+
+# receives the models from the solver (as JsonPrinter does)
+class ModelPrinter(printer.Printer):
+
+    def __init__(self, handle, improving):
+        self.handle    = handle
+        self.improving = improving
+        self.model     = None
+        self.yielded   = False
+        self.stats     = None
+
+    def do_print(self, *args, **kwargs):
+        pass
+
+    def __finish(self):
+        if self.model is not None and self.improving and not self.yielded:
+            self.handle.put(self.model.copy())
+        self.yielded = True
+
+    def answer(self, number, step):
+        self.__finish()
+        self.model, self.yielded = Model(number, step), False
+
+    def shown(self, shown, holds):
+        if self.model is not None:
+            self.model.shown, self.model.holds = list(shown), list(holds)
+
+    def optimality(self, string):
+        if self.model is not None:
+            self.model.optimality = string
+            self.handle.put(self.model)
+            self.model, self.yielded = self.model.copy(), True
+
+    def before_solve(self):
+        if self.handle.closed:
+            raise solver.EndException
+        self.__finish()
+
+    def print_stats(self, ctl, models, more_models,
+                    opt_models, non_optimal, stats,
+                    interrupted, solved, copy_statistics, _file):
+        self.__finish()
+        self.model = None
+        self.stats = self.get_stats(
+            ctl, models, more_models, opt_models, non_optimal, stats,
+            interrupted or self.handle.closed, solved, copy_statistics
+        )
+
+
+class SolveHandle:
+
+    def __init__(self, options, clingo_options, underscores):
+        self.options        = options
+        self.clingo_options = clingo_options
+        self.underscores    = underscores
+        self.printer        = ModelPrinter(self, options['quiet'] == 0)
+        self.asprin         = None
+        self.queue          = queue.Queue(maxsize=1)
+        self.thread         = None
+        self.closed         = False
+        self.done           = False
+        self.error          = None
+        self.statistics     = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # called by the thread of asprin
+    def put(self, item):
+        if not self.closed or item is END:
+            self.queue.put(item)
+
+    # errors after closing the handle are ignored
+    def __run(self):
+        _solver = None
+        try:
+            asprin = main.Asprin()
+            asprin.options = self.options
+            asprin.printer = self.printer
+            with lock:
+                control_proxy = asprin.start_control(
+                    self.clingo_options, signals=False
+                )
+                self.asprin = asprin
+                asprin.load_to_clingo()
+                programs = asprin.parse_specification(self.underscores)
+                _solver = asprin.get_solver(programs, control_proxy)
+            _solver.run()
+        except SystemExit as e:
+            if e.code and not self.closed:
+                self.error = RuntimeError(ERROR_EXIT.format(e.code))
+        except BaseException as e:
+            if not self.closed:
+                self.error = e
+        if _solver is not None and self.error is None:
+            if self.printer.stats is None:
+                _solver.print_stats()
+            self.statistics = self.printer.stats
+        self.put(END)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.__run, daemon=True)
+            self.thread.start()
+
+    def __iter__(self):
+        self.start()
+        try:
+            while not self.done:
+                item = self.queue.get()
+                if item is END:
+                    self.join()
+                    break
+                yield item
+        finally:
+            self.close()
+        if self.error is not None:
+            raise self.error
+        return self.statistics
+
+    def join(self):
+        self.done = True
+        self.thread.join()
+
+    def interrupt(self):
+        if self.asprin is not None:
+            self.asprin.control.interrupt()
+
+    def close(self):
+        self.closed = True
+        if self.thread is None or self.done:
+            return
+        while True:
+            self.interrupt()
+            try:
+                item = self.queue.get(timeout=INTERRUPT_TIME)
+            except queue.Empty:
+                continue
+            if item is END:
+                break
+        self.join()
+
+
+# the models are awaited in the event loop, while asprin runs in its thread,
+# and cancelling the task that awaits a model interrupts the search
+class AsyncSolveHandle(SolveHandle):
+
+    def __init__(self, options, clingo_options, underscores):
+        SolveHandle.__init__(self, options, clingo_options, underscores)
+        self.loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    # called by the thread of asprin
+    def put(self, item):
+        if not self.closed or item is END:
+            future = asyncio.run_coroutine_threadsafe(
+                self.queue.put(item), self.loop
+            )
+            # after END, the event loop may be waiting to join this thread
+            if item is not END:
+                future.result()
+
+    def start(self):
+        if self.thread is None:
+            self.loop = asyncio.get_running_loop()
+            self.queue = asyncio.Queue(maxsize=1)
+            SolveHandle.start(self)
+
+    # the thread is joined in another thread, not to block the event loop
+    async def ajoin(self):
+        self.done = True
+        await self.loop.run_in_executor(None, self.thread.join)
+
+    async def __aiter__(self):
+        self.start()
+        try:
+            while not self.done:
+                item = await self.queue.get()
+                if item is END:
+                    await self.ajoin()
+                    break
+                yield item
+        finally:
+            await self.aclose()
+        if self.error is not None:
+            raise self.error
+
+    # the handle may be closed at the same time by another task: the event
+    # loop closes the async generator of __aiter__ in a task of its own, and
+    # only one of them receives END
+    async def aclose(self):
+        self.closed = True
+        if self.thread is None:
+            return
+        while not self.done:
+            self.interrupt()
+            try:
+                item = await asyncio.wait_for(
+                    self.queue.get(), INTERRUPT_TIME
+                )
+            except asyncio.TimeoutError:
+                continue
+            if item is END:
+                await self.ajoin()
+
+
+def get_options(files, strings, clingo_options, options):
+    options.setdefault('quiet', 1)
+    return main.AsprinArgumentParser().run_keywords(
+        files, strings, clingo_options, options
+    )
+
+def solve(files=(), strings=(), clingo_options=(), **options):
+    return SolveHandle(*get_options(files, strings, clingo_options, options))
+
+def solve_async(files=(), strings=(), clingo_options=(), **options):
+    return AsyncSolveHandle(
+        *get_options(files, strings, clingo_options, options)
+    )
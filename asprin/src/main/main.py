@@ -33,6 +33,12 @@ import sys
 import clingo
 import os
 import errno
+import copy
+import io
+import contextlib
+import multiprocessing
+import functools
+import json
 from ..spec_parser    import           spec_parser
 from ..program_parser import        program_parser
 from ..solver         import                solver
@@ -40,6 +46,7 @@ from ..utils          import               printer
 from ..utils          import clingo_signal_handler
 from ..utils          import                 utils
 from .                import           clingo_help
+from .                import                server
 from ..solver.metasp  import                metasp
 
 
@@ -67,9 +74,34 @@ ERROR_PARSING  = "parsing failed"
 #ERROR_IMPROVE_1 = "options --stats and --improve-limit cannot be used together"
 ERROR_IMPROVE_2 = """incorrect value for option --improve-limit, \
 options reprint and nocheck cannot be used together"""
+ERROR_SERVER    = "option --server requires some input file"
+ERROR_PORTFOLIO = "option --portfolio requires option --configs"
+ERROR_CLEAN_UP  = "incorrect value for option --clean-up"
+ERROR_OUTF      = "incorrect value for option --outf"
+ERROR_WARM_START = "incorrect value for option --warm-start: {}"
+ERROR_WARM_START_BOUND = """option --warm-start with ',bound' cannot be used \
+together with options --approximation, --solving-mode=core, --meta=simple \
+or --cubes"""
+ERROR_CHECKPOINT = "incorrect value for option --checkpoint"
+ERROR_RESUME     = "incorrect value for option --resume: {}"
+ERROR_CHECKPOINT_MODE = """options --checkpoint and --resume cannot be used \
+together with options --approximation, --solving-mode=core, --meta=simple \
+or --cubes"""
+ERROR_BISECT    = """option --bisect cannot be used together with options \
+--approximation, --solving-mode=core, --meta=simple or --cubes"""
+ERROR_CORE      = """options --solving-mode=core and --approximation cannot \
+be used together"""
+ERROR_KEYWORD   = "unknown option {}"
+ERROR_KEYWORD_VALUE = "incorrect value for option {}"
+NO_KEYWORDS     = ["help", "clingo_help", "version", "test", "server", "outf",
+                   "print_programs"]
+ERROR_CUBES     = """option --cubes cannot be used together with options \
+--approximation, --solving-mode=core, --improve-limit, --meta=simple \
+or --non-optimal"""
 DEBUG          = "--debug"
 TEST           = "--test"
 ALL_CONFIGS    = ["tweety", "trendy", "frumpy", "crafty", "jumpy", "handy"]
+THREADS        = r'^(-t|--parallel-mode)'
 HELP_PROJECT   = """R|: Enable projective solution enumeration,
   projecting on the formulas of the specification"""
 HELP_HEURISTIC = """R|: Apply domain heuristics with value <v> and modifier <m>
@@ -78,6 +110,10 @@ HELP_ON_OPT_HEURISTIC = """R|: Apply domain heuristics depending on the last opt
   <t> has the form [+|-],[s|p],<v>,<m> and applies value <v> and modifier <m>
   to the atoms that are either true (+) or false (-) in the last optimal model 
   and that either are shown (s) or appear in the preference specification (p)"""
+HELP_SOLVING_MODE = """R|: Run {normal|core} solving mode, where core computes the
+  optimal models of the weak approximation with unsatisfiable core based
+  optimization (option --opt-strategy=usc of clingo), and works with the
+  preference types that have a weak approximation program"""
 HELP_DELETE_BETTER = """R|: After computing an optimal model,
   add a program to delete models better than that one"""
 HELP_TOTAL_ORDER = """R|: Do not add programs for optimal models after the \
@@ -85,6 +121,18 @@ first one
   Use only if the preference specification represents a total order"""
 HELP_GROUND_ONCE = """R|: Ground preference program only once \
 (for improving a model)"""
+HELP_GROUND_ADAPTIVE = """R|: Ground preference program for every model, \
+and switch to
+  grounding it only once if grounding takes more time than solving"""
+HELP_TRACE = """R|: Write to <file> a JSON line with the times of every \
+solving step"""
+HELP_OUTF = """R|: Print the models and the statistics in JSON format
+  json[,holds]  : as one JSON document
+  jsonl[,holds] : as one JSON object per line
+  with holds, print also the holds atoms of the models"""
+HELP_PROFILE = """R|: Print a histogram of the times of the events \
+of the solving loop
+  (to the standard error with option --outf)"""
 HELP_CLINGO_HELP = ": Print {1=basic|2=more|3=full} clingo help and exit"
 HELP_RELEASE_LAST = """R|: Improving a model, release the preference program \
 for the last model
@@ -94,6 +142,27 @@ HELP_VOLATILE_IMPROVING = """R|: Use volatile preference programs \
 for improving a model"""
 HELP_VOLATILE_OPTIMAL = """R|: Use volatile preference programs \
 for optimal models"""
+HELP_TIME_LIMIT = """R|: Stop after <t> seconds, printing the last model of the \
+current
+  improvement chain as a model found with search limit"""
+HELP_STEP_TIME_LIMIT = """R|: Stop improving a model after <t> seconds in a step,
+  as if the search limit of option --improve-limit was reached"""
+HELP_WARM_START = """R|: Seed the first solving step with the model in <file>,
+  written by a previous run (the atoms of its last model, or --outf output),
+  applying domain heuristics on its shown and holds atoms;
+  add ',bound' to require a model better than that one
+  (this needs its holds atoms, as written by --outf=<m>,holds)"""
+HELP_CHECKPOINT = """R|: Write the optimal models computed so far to <file>
+  after every <n> optimal models (default: 1) and at the end,
+  so that a later run can continue with option --resume"""
+HELP_RESUME = """R|: Continue the run that wrote <file> with option --checkpoint,
+  deleting its optimal models at the start"""
+HELP_CLEAN_UP = """R|: Clean up the clingo control object
+  step : after every step
+  auto[,<e>,<g>,<l>] : when since the last clean up <e> externals were \
+released,
+    the symbolic atoms grew by <g>%%, or <l> nogoods were learnt
+    (auto is auto,100,50,100000)"""
 HELP_TRANS_EXT = """R|: Configure handling of extended rules \
 for non base programs
   (<m> should be as in clingo --trans-ext option)"""
@@ -113,8 +182,19 @@ optimal"""
 # quick projects and is complete, but does not reprint the unknown models
 # at the end, while nocheck projects and never checks if the unknown models are
 # optimal,  hence it is not complete
+HELP_BISECT = """R|: Improving a model, if the optimized preference is of type
+  less(weight), more(weight), minmax or maxmin, look first for a model
+  whose value is halfway between the current one and a lower bound"""
 HELP_CONFIGS = """R|: Run clingo configurations c1, ..., cn iteratively
   (use 'all' for running all configurations)"""
+HELP_CUBES = """R|: Split the search for optimal models into 2^<k> cubes
+  over <k> atoms of the preference specification,
+  solve every cube in a different process,
+  and check that the models found are optimal for the whole problem
+  (with -n <n>, every cube computes at most <n> models)"""
+HELP_PORTFOLIO = """R|: Run the configurations of option --configs in parallel,
+  one per solver thread, instead of iteratively
+  (unless given, option --parallel-mode is set to the number of configurations)"""
 HELP_NO_META = """R|: Do not use meta-programming solving methods
   Note: This may be incorrect for computing many models when the preference program
         is not stratified"""
@@ -127,6 +207,9 @@ HELP_META     = """R|: Apply or disable meta-programming solving methods, where
         this may be incorrect for computing many models using nonstratified preference programs
   Add ',bin' to use a clingo binary for reification
   Add ',sat' to use a clingo binary and systems lp2normal2 and lp2sat for reification"""
+HELP_SERVER = """R|: Parse and translate the input files once, and then answer
+  one JSON request per line of the standard input
+  (see asprin/src/main/server.py for the protocol)"""
 
 #
 # VERSION
@@ -258,6 +341,85 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         except Exception as e:
             self.__cmd_parser.error(str(e))
 
+    def __do_clean_up(self, string):
+        if string is None:
+            return None
+        if string == 'step':
+            return [0, 0, 0]
+        match = re.match(r'auto(,(\d+),(\d+),(\d+))?$', string)
+        if not match:
+            self.__cmd_parser.error(ERROR_CLEAN_UP)
+        if match.group(1) is None:
+            return [100, 50, 100000]
+        return [int(match.group(i)) for i in range(2, 5)]
+
+    def __do_outf(self, string):
+        if string is None:
+            return None, False
+        match = re.match(r'(jsonl|json)(,holds)?$', string)
+        if not match:
+            self.__cmd_parser.error(ERROR_OUTF)
+        return match.group(1), match.group(2) is not None
+
+    def __do_checkpoint(self, string):
+        if string is None:
+            return None
+        match = re.match(r'(.+?)(,(\d+))?$', string)
+        n = int(match.group(3)) if match.group(3) is not None else 1
+        if n == 0:
+            self.__cmd_parser.error(ERROR_CHECKPOINT)
+        return [match.group(1), n]
+
+    def __do_resume(self, filename):
+        if filename is None:
+            return None
+        try:
+            with open(filename) as f:
+                resume = json.load(f)
+            for key in ["domain", "steps", "holds", "numbers", "step",
+                        "models", "opt_models"]:
+                if key not in resume:
+                    raise ValueError("missing key '{}'".format(key))
+        except Exception as e:
+            self.__cmd_parser.error(ERROR_RESUME.format(e))
+        return resume
+
+    # returns the shown and holds atoms (as strings) of the last model
+    # in a file with the output of asprin, with --outf or without it,
+    # or with a list of atoms
+    def __read_warm_start(self, filename):
+        with open(filename) as f:
+            content = f.read()
+        if content.lstrip().startswith("{"):
+            try:
+                document = json.loads(content)
+                records = document.get("models", [document])
+            except ValueError:
+                records = [json.loads(i) for i in content.splitlines()
+                           if i.strip()]
+            records = [i for i in records if "shown" in i]
+            if not records:
+                return [], []
+            return records[-1]["shown"], records[-1].get("holds", [])
+        lines = content.splitlines()
+        answers = [i for i, line in enumerate(lines)
+                   if line.startswith("Answer:")]
+        if answers:
+            lines = lines[answers[-1]+1:answers[-1]+2]
+        return [atom for line in lines for atom in line.split()], []
+
+    def __do_warm_start(self, string):
+        if string is None:
+            return None, None, False
+        match = re.match(r'(.+?)(,bound)?$', string)
+        try:
+            shown, holds = self.__read_warm_start(match.group(1))
+            for atom in shown + holds:
+                clingo.parse_term(atom)
+        except Exception as e:
+            self.__cmd_parser.error(ERROR_WARM_START.format(e))
+        return shown, holds, match.group(2) is not None
+
     def __do_on_opt_heur(self, on_opt_heur):
         out = []
         try:
@@ -302,7 +464,7 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         # return
         return method, query, binary, sat
 
-    def run(self, args):
+    def __get_parser(self):
 
         # command parser
         _epilog = self.clingo_help + "\nusage: " + self.usage + self.epilog
@@ -358,8 +520,14 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
                            help=argparse.SUPPRESS)
         basic.add_argument('--to-clingo', dest='to_clingo',
                            action="append", help=argparse.SUPPRESS, default=[])
-        basic.add_argument('--benchmark', dest='benchmark', action='store_true',
-                           help=argparse.SUPPRESS)
+        basic.add_argument('--outf', dest='outf', metavar='<m>',
+                           help=HELP_OUTF, default=None)
+        basic.add_argument('--trace', dest='trace', metavar='<file>',
+                           help=HELP_TRACE, default=None)
+        basic.add_argument('--profile', dest='profile', action='store_true',
+                           help=HELP_PROFILE)
+        basic.add_argument('--server', dest='server', action='store_true',
+                           help=HELP_SERVER)
 
         # Solving Options
         solving = cmd_parser.add_argument_group('Solving Options')
@@ -377,6 +545,9 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
                              help=""": Run {weak|heuristic} \
                                        approximation mode""",
                              choices=["weak", "heuristic"])
+        solving.add_argument('--solving-mode', dest='solving_mode',
+                             metavar="<m>", help=HELP_SOLVING_MODE,
+                             choices=["normal", "core"], default=None)
         solving.add_argument('--dom-heur', dest='cmd_heuristic',
                               nargs=2, metavar=('<v>','<m>'),
                               help=HELP_HEURISTIC)
@@ -386,6 +557,9 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--configs', dest='configs',
                               metavar='<ci>', action='append',
                               help=HELP_CONFIGS)
+        solving.add_argument('--portfolio', dest='portfolio',
+                              help=HELP_PORTFOLIO,
+                              action='store_true')
         solving.add_argument('--meta ', dest='meta', help=HELP_META,
                              type=str, metavar='<m>', default=None)
         solving.add_argument('--preference-unsat', dest='preference_unsat',
@@ -395,6 +569,24 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--improve-limit',
                              metavar='<m>', dest='improve_limit',
                              help=HELP_IMPROVE_LIMIT)
+        solving.add_argument('--bisect', dest='bisect',
+                             help=HELP_BISECT, action='store_true')
+        solving.add_argument('--time-limit', dest='time_limit',
+                             help=HELP_TIME_LIMIT, type=float, metavar='<t>',
+                             default=0)
+        solving.add_argument('--step-time-limit', dest='step_time_limit',
+                             help=HELP_STEP_TIME_LIMIT, type=float,
+                             metavar='<t>', default=0)
+        solving.add_argument('--warm-start', dest='warm_start',
+                             help=HELP_WARM_START, metavar='<file>',
+                             default=None)
+        solving.add_argument('--checkpoint', dest='checkpoint',
+                             help=HELP_CHECKPOINT, metavar='<file>[,<n>]',
+                             default=None)
+        solving.add_argument('--resume', dest='resume', help=HELP_RESUME,
+                             metavar='<file>', default=None)
+        solving.add_argument('--cubes', dest='cubes', help=HELP_CUBES,
+                             type=int, metavar='<k>', default=0)
 
         # Additional Solving Options
         solving = cmd_parser.add_argument_group('Additional Solving Options')
@@ -402,8 +594,8 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
                              help=argparse.SUPPRESS,
                              # help=": Execute at most <s> steps",
                              type=int, dest='steps', metavar='<s>', default=0)
-        basic.add_argument('--clean-up', dest='clean_up', action='store_true',
-                           help=argparse.SUPPRESS)
+        solving.add_argument('--clean-up', dest='clean_up',
+                             help=HELP_CLEAN_UP, metavar='<m>', default=None)
         solving.add_argument('--delete-better', dest='delete_better',
                              help=HELP_DELETE_BETTER,
                              action='store_true')
@@ -413,6 +605,9 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--ground-once', dest='ground_once',
                              help=HELP_GROUND_ONCE,
                              action='store_true')
+        solving.add_argument('--ground-adaptive', dest='ground_adaptive',
+                             help=HELP_GROUND_ADAPTIVE,
+                             action='store_true')
         solving.add_argument('--release-last', dest='release_last',
                              help=HELP_RELEASE_LAST,
                              action='store_true')
@@ -428,6 +623,11 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--pref-trans-ext', dest='trans_ext',
                              help=HELP_TRANS_EXT, metavar="<m>", default=None)
 
+        return cmd_parser
+
+    def run(self, args):
+
+        cmd_parser = self.__get_parser()
         options, unknown = cmd_parser.parse_known_args(args=args)
         options = vars(options)
 
@@ -455,12 +655,82 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         # when no files, add stdin
         # build prologue
         if options['files'] == []:
+            if options['server']:
+                self.__cmd_parser.error(ERROR_SERVER)
             self.__first_file = "stdin"
             options['files'].append(("-","-"))
         if len(options['files'])>1:
             self.__first_file += " ..."
         prologue = "asprin version " + VERSION + "\nReading from "
         prologue += self.__first_file
+        options['strings'] = []
+
+        self.__process(options, clingo_options)
+
+        # return
+        return options, clingo_options, self.underscores, prologue, \
+               self.__file_warnings
+
+    # options given as keyword arguments (see api.py): <files> and <strings>
+    # are lists of files and programs, and every keyword is a long option
+    # (with '_' instead of '-') whose value is as in the command line
+    # (True or False for flags, and lists for options that can be repeated)
+    def run_keywords(self, files, strings, clingo_options, keywords):
+
+        cmd_parser = self.__get_parser()
+        options = vars(cmd_parser.parse_known_args(args=[])[0])
+
+        # long options
+        actions = {}
+        for action in cmd_parser._actions:
+            for i in action.option_strings:
+                key = i.strip()[2:].replace("-", "_")
+                if i.startswith("--") and key not in NO_KEYWORDS:
+                    actions[key] = action
+
+        # keywords: their values are converted and checked by the actions of
+        # the parser, as in the command line
+        namespace = argparse.Namespace(**options)
+        for key, value in keywords.items():
+            action = actions.get(key)
+            if action is None:
+                self.__cmd_parser.error(ERROR_KEYWORD.format(key))
+            option_string = "--" + key.replace("_", "-")
+            if action.nargs == 0:
+                if value:
+                    action(cmd_parser, namespace, [], option_string)
+                else:
+                    setattr(namespace, action.dest, action.default)
+                continue
+            if value is None:
+                setattr(namespace, action.dest, action.default)
+                continue
+            # options that can be repeated take a list of values
+            values = value
+            if not isinstance(action, argparse._AppendAction) or \
+               not isinstance(value, (list, tuple)):
+                values = [value]
+            for i in values:
+                if not isinstance(i, (list, tuple)):
+                    i = [i]
+                try:
+                    i = cmd_parser._get_values(action, [str(j) for j in i])
+                except argparse.ArgumentError:
+                    self.__cmd_parser.error(ERROR_KEYWORD_VALUE.format(key))
+                action(cmd_parser, namespace, i, option_string)
+        options = vars(namespace)
+
+        # files, strings and clingo options
+        options['files'] = []
+        for i in files:
+            self.__add_file(options['files'], i)
+        options['strings'] = list(strings)
+        clingo_options = list(clingo_options)
+
+        self.__process(options, clingo_options)
+        return options, clingo_options, self.underscores
+
+    def __process(self, options, clingo_options):
 
         # handle constants
         options['constants']    = self.__do_constants(options['constants'])
@@ -474,17 +744,44 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
             options['project'] = True
         options['improve_limit'] = option
 
+        # handle clean_up
+        options['clean_up'] = self.__do_clean_up(options['clean_up'])
+
+        # handle outf
+        options['outf'], options['outf_holds'] = \
+            self.__do_outf(options['outf'])
+
+        # handle warm_start
+        options['warm_start'], options['warm_start_holds'], \
+            options['warm_start_bound'] = \
+            self.__do_warm_start(options['warm_start'])
+
+        # handle checkpoint and resume
+        options['checkpoint'] = self.__do_checkpoint(options['checkpoint'])
+        options['resume'] = self.__do_resume(options['resume'])
+
         # handle configs all
         if options['configs'] and 'all' in options['configs']:
             options['configs'] = ALL_CONFIGS
 
+        # handle portfolio
+        if options['portfolio']:
+            if not options['configs']:
+                self.__cmd_parser.error(ERROR_PORTFOLIO)
+            if not [i for i in clingo_options if re.match(THREADS, i)]:
+                clingo_options.append(
+                    "--parallel-mode={}".format(len(options['configs']))
+                )
+
         # handle on_opt_heur
         on_opt_heur = options['on_opt_heur']
         if on_opt_heur:
             options['on_opt_heur'] = self.__do_on_opt_heur(on_opt_heur)
 
         # handle solving_mode
-        options['solving_mode'] = 'normal' # used in meta
+        if options['solving_mode'] == 'core' and options['approximation']:
+            self.__cmd_parser.error(ERROR_CORE)
+        options['solving_mode'] = options['solving_mode'] or 'normal' # meta
         if options.get('approximation','') == 'weak':
             options['solving_mode'] = "weak"
         elif options.get('approximation','') == 'heuristic':
@@ -498,14 +795,37 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         options['meta_binary'] = binary
         options['meta_sat'] = sat
 
+        # handle cubes (option 'cube' is set only by the processes of a cube)
+        if options['cubes'] and (options['solving_mode'] != 'normal' or
+                                 options['improve_limit'] is not None or
+                                 options['meta'] == META_SIMPLE or
+                                 options['non_optimal']):
+            self.__cmd_parser.error(ERROR_CUBES)
+        options['cube'] = None
+
+        # handle checkpoint and resume
+        if (options['checkpoint'] is not None or
+            options['resume'] is not None) and (
+                options['solving_mode'] != 'normal' or
+                options['meta'] == META_SIMPLE or options['cubes']):
+            self.__cmd_parser.error(ERROR_CHECKPOINT_MODE)
+
+        # handle bisect
+        if options['bisect'] and (options['solving_mode'] != 'normal' or
+                                  options['meta'] == META_SIMPLE or
+                                  options['cubes']):
+            self.__cmd_parser.error(ERROR_BISECT)
+
+        # handle warm_start bound
+        if options['warm_start_bound'] and (options['solving_mode'] != 'normal'
+                                            or options['meta'] == META_SIMPLE
+                                            or options['cubes']):
+            self.__cmd_parser.error(ERROR_WARM_START_BOUND)
+
         # statistics
         # if options['stats']:
         clingo_options.append('--stats')
 
-        # return
-        return options, clingo_options, self.underscores, prologue, \
-               self.__file_warnings
-
 
 
 #
@@ -516,6 +836,12 @@ class Asprin:
     def __init__(self):
         self.control = None
         self.options = None
+        self.hooks = []
+        self.printer = None
+
+    # add a hook (see solver/hooks.py) to the next solve() call
+    def add_hook(self, hook):
+        self.hooks.append(hook)
 
     def __update_constants(self, options, constants):
         for i in constants:
@@ -529,10 +855,15 @@ class Asprin:
             raise argparse.ArgumentError(None, e.message)
 
     def __signal_on_not_solved(self):
-        printer.Printer().print_stats(self.control, 0, True, 0,
-                                      self.options['non_optimal'],
-                                      self.options['stats'], 
-                                      True, False, None, None)
+        _printer = printer.Printer()
+        if self.options['outf'] is not None:
+            _printer = printer.JsonPrinter(
+                self.options['outf'], self.options['outf_holds']
+            )
+        _printer.print_stats(self.control, 0, True, 0,
+                             self.options['non_optimal'],
+                             self.options['stats'],
+                             True, False, None, None)
         sys.exit(1)
 
     def run_wild(self, args):
@@ -552,31 +883,68 @@ class Asprin:
             printer.Printer().do_print(out)
             sys.exit(0)
 
-        # create Control object
-        self.control = self.__get_control(clingo_options)
+        # server mode
+        if self.options["server"]:
+            for i in warnings:
+                printer.Printer().warning_included_file(i)
+            server.Server(Asprin, self.options, clingo_options, u).run()
+            return
 
-        # signal handler
-        control_proxy = clingo_signal_handler.ClingoSignalHandler(
-            self.control, "asprin",
-            print_after_solving=self.options['stats_after_solving'],
-            function_on_not_solved=self.__signal_on_not_solved
-        )
+        # create Control object and signal handler
+        control_proxy = self.start_control(clingo_options)
 
         # print prologue and warnings
-        print(prologue)
+        if self.options['outf'] is None:
+            print(prologue)
         for i in warnings:
             printer.Printer().warning_included_file(i)
 
         # load --to-clingo files
+        self.load_to_clingo()
+
+        # specification parsing
+        programs = self.parse_specification(u)
+
+        # preference programs parsing and solving
+        self.solve(programs, control_proxy)
+
+    def start_control(self, clingo_options, signals=True):
+        # create Control object
+        self.clingo_options = clingo_options
+        self.control = self.__get_control(clingo_options)
+        # signal handler
+        return clingo_signal_handler.ClingoSignalHandler(
+            self.control, "asprin",
+            print_after_solving=self.options['stats_after_solving'],
+            function_on_not_solved=self.__signal_on_not_solved,
+            signals=signals
+        )
+
+    def load_to_clingo(self):
         for i in self.options["to_clingo"]:
             self.control.load(i)
 
-        # specification parsing
+    def parse_specification(self, u):
         sp = spec_parser.Parser(u, self.options)
         programs, utils.underscores, base_constants, self.options['show'] = \
                                                      sp.parse_files()
         self.__update_constants(self.options, base_constants)
-        del sp
+        return programs
+
+    # translations is a cache of translated preference programs (see server)
+    def solve(self, programs, control_proxy, translations=None):
+        _solver = self.get_solver(programs, control_proxy, translations)
+        _solver.run()
+        return _solver
+
+    def get_solver(self, programs, control_proxy, translations=None):
+
+        # option --cubes: copy programs before they are modified
+        cube_runner = None
+        if self.options['cubes']:
+            cube_runner = CubeRunner(
+                self.options, self.clingo_options, copy.deepcopy(programs)
+            )
 
         # observer
         observer = None
@@ -599,7 +967,7 @@ class Asprin:
 
         # preference programs parsing
         _program_parser = program_parser.Parser(
-            self.control, programs, self.options, observer
+            self.control, programs, self.options, observer, translations
         )
         _program_parser.parse()
         del _program_parser
@@ -611,7 +979,12 @@ class Asprin:
         control_proxy.function_on_solving = _solver.signal_on_solving
         control_proxy.function_on_not_solving = _solver.signal_on_not_solving
         control_proxy.function_after_solving = _solver.signal_after_solving
-        _solver.run()
+        _solver.cube_runner = cube_runner
+        for hook in self.hooks:
+            _solver.add_hook(hook)
+        if self.printer is not None:
+            _solver.printer = _solver.model_printer = self.printer
+        return _solver
 
 
     def run(self, args):
@@ -645,6 +1018,47 @@ class Asprin:
             sys.exit(65)
         sys.exit(0)
 
+#
+# option --cubes
+#
+
+# runs asprin on a cube (in a different process), and returns its optimal models
+# (at most as many as option -n asks for)
+def run_cube(options, clingo_options, programs, underscores, cube):
+    options = copy.deepcopy(options)
+    options['cubes'], options['cube'] = 0, cube
+    options['outf'] = None
+    utils.underscores = underscores
+    asprin = Asprin()
+    asprin.options = options
+    with contextlib.redirect_stdout(io.StringIO()):
+        # no signal handlers: the pool terminates its workers with SIGTERM
+        control_proxy = asprin.start_control(clingo_options, signals=False)
+        asprin.load_to_clingo()
+        _solver = asprin.solve(programs, control_proxy)
+    return _solver.cube_models
+
+class CubeRunner:
+
+    def __init__(self, options, clingo_options, programs):
+        self.options = options
+        self.clingo_options = clingo_options
+        self.programs = programs
+
+    # yields the optimal models of every cube, in the order of the cubes
+    def run(self, cubes):
+        function = functools.partial(
+            run_cube, self.options, self.clingo_options,
+            self.programs, utils.underscores
+        )
+        pool = multiprocessing.get_context("spawn").Pool()
+        try:
+            for models in pool.imap(function, cubes):
+                yield models
+        finally:
+            pool.terminate()
+
+
 def main(args):
     if TEST in args:
         args.remove(TEST)
@@ -0,0 +1,121 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Server mode (option --server)
+#
+# The input files (and asprin_lib.lp) are parsed only once, and the translated
+# preference programs are cached by preference types, so that every request
+# only grounds and solves.
+#
+# Protocol: one JSON object per line in the standard input, with keys
+#   "facts"  : string added to the base program (optional)
+#   "models" : number of models to compute, as option -n (optional)
+#   "id"     : any value, copied to the response (optional)
+# and one JSON object per line in the standard output, with keys
+#   "id"     : the id of the request (or null)
+#   "output" : the output of asprin for the request
+#   "code"   : the exit code that asprin would have returned
+#   "error"  : the error message (only if there was an error)
+#
+
+from __future__ import print_function
+import sys
+import copy
+import json
+import io
+import contextlib
+from ..utils import utils
+
+BASE = utils.BASE
+
+ERROR_REQUEST = "incorrect request: {}"
+
+
+class Server:
+
+    def __init__(self, asprin_class, options, clingo_options, underscores):
+        self.asprin_class   = asprin_class
+        self.options        = options
+        self.clingo_options = clingo_options
+        self.underscores    = underscores
+        self.programs       = None
+        self.translations   = {}
+
+    def run(self):
+        # parse the specification once
+        asprin = self.asprin_class()
+        asprin.options = self.options
+        self.programs = asprin.parse_specification(self.underscores)
+        # serve requests
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            response = self.handle(line)
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+    def handle(self, line):
+        response = {"id" : None, "output" : "", "code" : 0}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+            response["id"] = request.get("id")
+        except ValueError as e:
+            response["code"] = 65
+            response["error"] = ERROR_REQUEST.format(e)
+            return response
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                self.solve(request)
+        except utils.SilentException:
+            pass
+        except SystemExit as e:
+            response["code"] = e.code
+        except utils.FatalException:
+            response["code"] = 65
+            response["error"] = "Fatal error, this should not happen."
+        except Exception as e:
+            response["code"] = 65
+            response["error"] = str(e)
+        response["output"] = output.getvalue()
+        return response
+
+    def solve(self, request):
+        # copy options and programs, and add the facts of the request
+        options = copy.deepcopy(self.options)
+        if "models" in request:
+            options['max_models'] = int(request["models"])
+        programs = copy.deepcopy(self.programs)
+        facts = request.get("facts", "")
+        if facts:
+            programs[BASE][""].extend_string(facts)
+        # create asprin object and solve
+        asprin = self.asprin_class()
+        asprin.options = options
+        control_proxy = asprin.start_control(self.clingo_options)
+        asprin.load_to_clingo()
+        asprin.solve(programs, control_proxy, self.translations)
@@ -172,14 +172,29 @@ class ObserverBuilderProxy:
         self.observer.add_statement(statement)
 
 
+class RecorderBuilderProxy:
+
+    def __init__(self, builder):
+        self.builder = builder
+        self.statements = []
+
+    def add(self, statement):
+        self.builder.add(statement)
+        self.statements.append(statement)
+
+
 class Parser:
 
-    def __init__(self, control, programs, options, observer):
+    # translations, if not None, is a dictionary used as a cache of the
+    # translated preference programs (it is shared among many Parser objects
+    # working on the same specification, see main/server.py)
+    def __init__(self, control, programs, options, observer, translations=None):
         self.__control = control
         self.__programs = programs
         self.__options = options
         self.__underscores = utils.underscores
         self.__observer = observer
+        self.__translations = translations
 
     def __add_and_ground(self, name, params, string, list):
         capturer = utils.Capturer(sys.stderr)
@@ -257,7 +272,7 @@ class Parser:
         programs = [(PREFERENCE, ERROR_NO_PREF_PROGRAM)]
         if self.__options['solving_mode'] == 'heuristic':
             programs.append((HEURISTIC, ERROR_NO_HEURISTIC_PROGRAM))
-        elif self.__options['solving_mode'] == 'weak':
+        elif self.__options['solving_mode'] in ['weak', 'core']:
             programs.append((APPROX, ERROR_NO_APPROX_PROGRAM))
         if self.__options['preference_unsat']:
             programs.append((UNSATP, ERROR_NO_UNSATP_PROGRAM))
@@ -374,7 +389,7 @@ class Parser:
         )
         visitors = [(PREFP, v)]
         # do approximations
-        if self.__options['solving_mode'] == 'weak':
+        if self.__options['solving_mode'] in ['weak', 'core']:
             v = basic.BasicProgramVisitor(
                 builder, APPROX, U_APPROX, constants
             )
@@ -435,5 +450,19 @@ class Parser:
             observer_builder = None
             if self.__observer:
                 observer_builder = ObserverBuilderProxy(builder, self.__observer)
-            self.add_programs(types, builder, observer_builder)
+            # no cache, or observer (that must see the translation)
+            if self.__translations is None or observer_builder:
+                self.add_programs(types, builder, observer_builder)
+                return
+            # cache: the translation depends only on the preference types
+            # (and on max_models for the stratification check)
+            key = (frozenset(types), self.__options['max_models'] != 1)
+            statements = self.__translations.get(key)
+            if statements is not None:
+                for statement in statements:
+                    builder.add(statement)
+                return
+            recorder = RecorderBuilderProxy(builder)
+            self.add_programs(types, recorder)
+            self.__translations[key] = recorder.statements
 
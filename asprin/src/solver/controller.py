@@ -22,6 +22,33 @@
 # -*- coding: utf-8 -*-
 
 from ..utils import utils
+import clingo
+import threading
+import json
+import os
+
+# --ground-adaptive: switch to ground once after ADAPTIVE_STEPS improving
+#                    steps, if grounding takes ADAPTIVE_RATIO times more
+#                    than solving, and at least ADAPTIVE_TIME seconds per step
+ADAPTIVE_STEPS = 3
+ADAPTIVE_RATIO = 1.0
+ADAPTIVE_TIME  = 0.01
+INFO_ADAPTIVE  = """INFO: switching to --ground-once after {} improving steps \
+(grounding {:.3f}s, solving {:.3f}s)"""
+# --solving-mode=core
+CORE_STRATEGY = "usc"
+# --clean-up
+STR_CLEAN_UP = "Clean ups    : {} (Externals: {} Atoms: {} Learnt: {})"
+STR_TIME_LIMIT  = "Time limit   : reached (Steps: {})"
+STR_STEP_LIMITS = "Step limits  : {}"
+GLOBAL_LIMIT = "global"
+STEP_LIMIT   = "step"
+# --bisect
+STR_BISECT     = "Bisection    : {} (Sat: {} Unsat: {})"
+WARNING_BISECT = """WARNING: option --bisect is ignored, it requires an \
+optimized preference of type less(weight), more(weight), minmax or maxmin"""
+# --checkpoint and --resume
+STR_RESUMED  = "Resumed      : {} optimal models (Steps: {})"
 
 class GeneralController:
 
@@ -35,6 +62,8 @@ class GeneralController:
         solver, options = self.solver, self.solver.options
         if options.trans_ext is not None:
             solver.control.configuration.asp.trans_ext = options.trans_ext
+        if options.portfolio:
+            solver.set_portfolio()
         # store nholds and set holds domain
         if solver.options.max_models != 1:
             solver.store_nholds = True
@@ -112,8 +141,248 @@ class GeneralController:
         if self.solver.options.steps == (self.solver.step - 1):
             self.solver.print_steps_message()
             self.solver.end()
-        if self.solver.options.clean_up:
-            self.solver.clean_up()
+
+
+class CleanUpController:
+
+    # option clean_up is None, or a list [externals, growth, learnt]:
+    # clean up when since the last clean up at least <externals> externals
+    # were released, or the symbolic atoms grew by <growth>%,
+    # or <learnt> nogoods were learnt (a 0 threshold is disabled,
+    # and if all thresholds are 0 it cleans up after every step)
+    def __init__(self, solver):
+        self.solver = solver
+        self.option = solver.options.clean_up
+        self.released, self.atoms, self.learnt = 0, None, 0
+        self.clean_ups = [0, 0, 0, 0] # total, externals, atoms, learnt
+
+    def get_learnt(self):
+        solvers = self.solver.control.statistics['solving']['solvers']
+        extra = solvers.get('extra')
+        if extra is None:
+            return int(solvers['conflicts'])
+        return int(extra['lemmas'] - extra['lemmas_deleted'])
+
+    def end_loop(self):
+        if self.option is None:
+            return
+        solver = self.solver
+        externals, growth, learnt = self.option
+        atoms = len(solver.control.symbolic_atoms)
+        if self.atoms is None:
+            self.atoms = atoms
+        if learnt:
+            self.learnt += self.get_learnt()
+        # check thresholds
+        if not externals and not growth and not learnt:
+            pass
+        elif externals and \
+             solver.released_externals - self.released >= externals:
+            self.clean_ups[1] += 1
+        elif growth and (atoms - self.atoms) * 100 >= growth * self.atoms:
+            self.clean_ups[2] += 1
+        elif learnt and self.learnt >= learnt:
+            self.clean_ups[3] += 1
+        else:
+            return
+        # clean up
+        solver.clean_up()
+        self.clean_ups[0] += 1
+        self.released = solver.released_externals
+        self.atoms = len(solver.control.symbolic_atoms)
+        self.learnt = 0
+
+    def print_stats(self, _file):
+        if self.option is None:
+            return
+        self.solver.printer.do_print(
+            STR_CLEAN_UP.format(*self.clean_ups), file=_file
+        )
+
+
+class TimeLimitController:
+
+    # options time_limit and step_time_limit are 0 (no limit) or a number of
+    # seconds: when a limit expires, a timer interrupts the solve calls
+    # (see ClingoSignalHandler.interrupt), and
+    # * with the global limit, the last model of the current improvement
+    #   chain (if any) is printed as a model found with search limit,
+    #   and asprin ends
+    # * with the step limit, the step ends as if the search limit of option
+    #   --improve-limit was reached (or asprin ends, if there is no model)
+    def __init__(self, solver):
+        self.solver = solver
+        self.time_limit = solver.options.time_limit
+        self.step_time_limit = solver.options.step_time_limit
+        self.timer, self.step_timer = None, None
+        self.expired = None
+        self.steps = None      # steps completed when the global limit expired
+        self.step_limits = 0
+        self.lock = threading.Lock()
+
+    def __start_timer(self, seconds, limit):
+        timer = threading.Timer(
+            seconds, self.expire, [limit, self.solver.step]
+        )
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    # called by the timers
+    def expire(self, limit, step):
+        with self.lock:
+            if limit == STEP_LIMIT and step != self.solver.step:
+                return
+            if self.expired != GLOBAL_LIMIT:
+                self.expired = limit
+            self.solver.control_proxy.interrupt()
+
+    def start(self):
+        if self.time_limit:
+            self.timer = self.__start_timer(self.time_limit, GLOBAL_LIMIT)
+
+    # the interrupts of a step limit do not reach the next step, while after
+    # the global limit the next solve call is interrupted at once
+    def start_loop(self):
+        with self.lock:
+            if self.expired == STEP_LIMIT:
+                self.expired = None
+            self.solver.control_proxy.time_out = self.expired == GLOBAL_LIMIT
+        if self.step_time_limit:
+            self.step_timer = self.__start_timer(
+                self.step_time_limit, STEP_LIMIT
+            )
+
+    def unknown(self):
+        if self.expired is None:
+            return
+        solver = self.solver
+        if self.expired == STEP_LIMIT:
+            self.step_limits += 1
+            if not solver.last_unsat:
+                return
+            # no model in the step: end
+        else:
+            # end with the last model of the improvement chain
+            self.steps = solver.step - 1
+            if not solver.last_unsat:
+                if solver.options.quiet == 1:
+                    solver.print_shown()
+                solver.print_limit_string()
+        solver.end()
+
+    def end_loop(self):
+        if self.step_timer is not None:
+            self.step_timer.cancel()
+            self.step_timer = None
+
+    def end(self):
+        for timer in (self.timer, self.step_timer):
+            if timer is not None:
+                timer.cancel()
+
+    def print_stats(self, _file):
+        if self.expired == GLOBAL_LIMIT:
+            steps = self.steps
+            if steps is None: # not in the solving loop
+                steps = self.solver.step - 1
+            self.solver.printer.do_print(
+                STR_TIME_LIMIT.format(steps), file=_file
+            )
+        if self.step_limits:
+            self.solver.printer.do_print(
+                STR_STEP_LIMITS.format(self.step_limits), file=_file
+            )
+
+
+class CheckpointController:
+
+    # option checkpoint is None, or [file, n]: the optimal models, as their
+    # step, holds bitset and model number, are written to file after every
+    # n optimal models and at the end, and option resume is None, or the
+    # contents of such a file, whose optimal models are deleted at the start
+    # (the holds bitsets refer to the holds domain written in the file)
+    def __init__(self, solver, optimal):
+        self.solver = solver
+        self.optimal = optimal
+        self.checkpoint = solver.options.checkpoint
+        self.resume = solver.options.resume
+        self.models = []  # (step, bitset, number)
+        self.written = 0
+        self.domain = None
+        self.started = False
+        if self.checkpoint is not None or self.resume is not None:
+            solver.set_holds_domain = True
+
+    # returns the bitset of the holds domain for the bitset of domain
+    def __convert(self, domain, bitset):
+        holds = [domain[i] for i in range(len(domain)) if (bitset >> i) & 1]
+        return self.solver.domain.bitset(
+            [clingo.parse_term(x) for x in holds]
+        )
+
+    def start(self):
+        solver = self.solver
+        self.domain = [str(x) for x in solver.holds_domain]
+        self.started = True
+        if self.resume is None:
+            return
+        resume = self.resume
+        for step, bitset, number in zip(
+            resume["steps"], resume["holds"], resume["numbers"]
+        ):
+            bitset = int(bitset, 16)
+            if resume["domain"] != self.domain:
+                bitset = self.__convert(resume["domain"], bitset)
+            self.models.append((step, bitset, number))
+            solver.mapping[step] = number
+        self.written = len(self.models)
+        self.optimal.resume([(x, y) for x, y, _ in self.models])
+        solver.step = max(solver.step, resume["step"])
+        solver.models = resume["models"]
+        solver.opt_models = resume["opt_models"]
+        if solver.options.max_models and \
+           solver.opt_models >= solver.options.max_models:
+            solver.end()
+
+    def unsat(self):
+        solver = self.solver
+        if not solver.last_unsat:
+            self.models.append(
+                (solver.last_model, solver.holds_bitset, solver.models)
+            )
+
+    def write(self):
+        solver = self.solver
+        checkpoint = {
+            "domain"     : self.domain,
+            "steps"      : [x for x, _, _ in self.models],
+            "holds"      : ["{:x}".format(x) for _, x, _ in self.models],
+            "numbers"    : [x for _, _, x in self.models],
+            "step"       : solver.step + 1,
+            "models"     : solver.models,
+            "opt_models" : solver.opt_models,
+        }
+        filename = self.checkpoint[0]
+        with open(filename + ".tmp", "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(filename + ".tmp", filename)
+        self.written = len(self.models)
+
+    def end_loop(self):
+        if self.checkpoint is not None and \
+           len(self.models) - self.written >= self.checkpoint[1]:
+            self.write()
+
+    def end(self):
+        if self.checkpoint is not None and self.started:
+            self.write()
+
+    def print_stats(self, _file):
+        if self.resume is not None and self.started:
+            self.solver.printer.do_print(STR_RESUMED.format(
+                len(self.resume["steps"]), self.resume["step"] - 1
+            ), file=_file)
 
 
 class GeneralControllerHandleOptimal:
@@ -157,6 +426,20 @@ class GeneralControllerHandleOptimal:
                                          self.delete_better,
                                          self.volatile)
 
+    # for --resume, with the optimal models given as (step, bitset)
+    def resume(self, models):
+        if not models:
+            return
+        self.__preprocess()
+        self.solver.handle_optimal_models(
+            models[:1], self.delete_worse, self.delete_better, self.volatile
+        )
+        if len(models) > 1:
+            self.__preprocess()
+            self.solver.handle_optimal_models(
+                models[1:], self.delete_worse, self.delete_better, self.volatile
+            )
+
     def unknown(self):
         self.start_step = True
         self.__preprocess()
@@ -258,6 +541,55 @@ class GroundOnceMethodController(MethodController):
         self.solver.turn_off_preference_program()
 
 
+class AdaptiveMethodController(MethodController):
+
+    def __init__(self, solver):
+        MethodController.__init__(self, solver)
+        self.many = GroundManyMethodController(solver)
+        self.once = None # built when switching (it sets store_nholds)
+        self.controller = self.many
+        solver.set_holds_domain = True # required to store_nholds later
+        self.steps, self.ground_time, self.solve_time = 0, 0.0, 0.0
+
+    def switch(self):
+        if self.steps < ADAPTIVE_STEPS:
+            return False
+        if self.ground_time < ADAPTIVE_TIME * self.steps:
+            return False
+        return self.ground_time > ADAPTIVE_RATIO * self.solve_time
+
+    def start_loop(self):
+        if self.controller is self.many and not self.solver.last_unsat:
+            if self.switch():
+                self.solver.printer.print_warning(INFO_ADAPTIVE.format(
+                    self.steps, self.ground_time, self.solve_time
+                ))
+                self.once = GroundOnceMethodController(self.solver)
+                # nholds of the last model (for unsat)
+                self.solver.nholds = self.solver.domain.nholds(
+                    self.solver.holds_bitset
+                )
+                self.once.start()
+                self.controller = self.once
+        self.controller.start_loop()
+
+    def solve(self):
+        self.controller.solve()
+        # improving step with ground many: measure
+        if self.controller is self.many and not self.solver.last_unsat:
+            # total includes the time since the last solve call
+            times = self.solver.control.statistics['summary']['times']
+            self.ground_time += times['total'] - times['solve']
+            self.solve_time  += times['solve']
+            self.steps += 1
+
+    def unsat(self):
+        if self.controller is self.once:
+            # release the programs grounded before switching
+            self.solver.relax_previous_models()
+        self.controller.unsat()
+
+
 class ApproxMethodController(MethodController):
 
     def __init__(self, solver):
@@ -269,6 +601,16 @@ class ApproxMethodController(MethodController):
         # finishes asprin
 
 
+# --solving-mode=core: the optimal models of the weak approximation are
+# computed with unsatisfiable core based optimization
+class CoreMethodController(ApproxMethodController):
+
+    def start(self):
+        for _solver in self.solver.control.configuration.solver:
+            _solver.opt_strategy = CORE_STRATEGY
+        ApproxMethodController.start(self)
+
+
 class HeurMethodController(MethodController):
 
     def __init__(self, solver):
@@ -301,6 +643,18 @@ class MetaMethodController(MethodController):
         self.solver.end()
 
 
+class CubeMethodController(MethodController):
+
+    def __init__(self, solver):
+        MethodController.__init__(self, solver)
+        self.solver.set_holds_domain = True
+
+    def start(self):
+        # solve the cubes in other processes
+        self.solver.solve_cubes()
+        # finishes asprin
+
+
 class ImproveLimitController(MethodController):
 
     def __init__(self, solver, controller):
@@ -354,6 +708,177 @@ class ImproveLimitController(MethodController):
         self.solver.handle_unknown_models(result)
 
 
+#
+# class Bisect (--bisect)
+#
+
+# defines (from utils)
+BISECT = utils.BISECT
+BISECT_PROGRAM = utils.BISECT_PROGRAM
+OPTIMIZE   = utils.OPTIMIZE
+PREFERENCE = utils.PREFERENCE
+
+# the value of a model for the optimized preference is at most b
+BISECT_RULES = """
+#external ##""" + BISECT + """(n).
+:- ##""" + BISECT + """(n), ##""" + OPTIMIZE + """(P),
+   ##""" + PREFERENCE + """(P,less(weight)),
+   #sum { W,T : ##""" + utils.HOLDS + """(X,0),
+                ##""" + PREFERENCE + """(P,_,_,for(X),T), W = @get(T,0) } > b.
+:- ##""" + BISECT + """(n), ##""" + OPTIMIZE + """(P),
+   ##""" + PREFERENCE + """(P,more(weight)),
+   #sum { W,T : ##""" + utils.HOLDS + """(X,0),
+                ##""" + PREFERENCE + """(P,_,_,for(X),T), W = @get(T,0) } < -b.
+:- ##""" + BISECT + """(n), ##""" + OPTIMIZE + """(P),
+   ##""" + PREFERENCE + """(P,minmax), ##""" + PREFERENCE + """(P,_,_,_,U),
+   G = @get(U,0),
+   #sum { W,T : ##""" + utils.HOLDS + """(X,0),
+                ##""" + PREFERENCE + """(P,_,_,for(X),T),
+                G = @get(T,0), W = @get(T,1) } > b.
+:- ##""" + BISECT + """(n), ##""" + OPTIMIZE + """(P),
+   ##""" + PREFERENCE + """(P,maxmin), ##""" + PREFERENCE + """(P,_,_,_,U),
+   G = @get(U,0),
+   #sum { W,T : ##""" + utils.HOLDS + """(X,0),
+                ##""" + PREFERENCE + """(P,_,_,for(X),T),
+                G = @get(T,0), W = @get(T,1) } < -b.
+"""
+LESS_WEIGHT = "less(weight)"
+MORE_WEIGHT = "more(weight)"
+MINMAX      = "minmax"
+MAXMIN      = "maxmin"
+
+class BisectController(MethodController):
+
+    # option bisect: if the optimized preference is of type less(weight),
+    # more(weight), minmax or maxmin, a model is better than another if its
+    # value is smaller, where the value is the sum of the weights (less),
+    # its opposite (more), the maximum sum of a group (minmax), or the
+    # opposite of the minimum sum of a group (maxmin); improving a model with
+    # value v, when there is no model with value smaller than lower, the step
+    # looks first for a model with value at most (lower+v-1)//2, and if there
+    # is none, sets lower to that bound plus one and repeats, until the bound
+    # is v-1 (that the preference program already requires)
+    def __init__(self, solver, controller):
+        MethodController.__init__(self, solver)
+        self.controller = controller
+        self.type = None
+        self.elements = {} # formula -> weight tuples
+        self.groups = set()
+        self.lower = None
+        self.steps, self.sat, self.unsat_steps = 0, 0, 0
+
+    def start(self):
+        self.controller.start()
+        solver = self.solver
+        atoms = solver.control.symbolic_atoms
+        name = None
+        for atom in atoms.by_signature(solver.underscores + OPTIMIZE, 1):
+            name = atom.symbol.arguments[0]
+        types = [
+            str(atom.symbol.arguments[1]) for atom in
+                atoms.by_signature(solver.underscores + PREFERENCE, 2)
+                if atom.symbol.arguments[0] == name
+        ]
+        if name is None or len(types) != 1 or types[0] not in [
+            LESS_WEIGHT, MORE_WEIGHT, MINMAX, MAXMIN
+        ]:
+            solver.printer.do_print(WARNING_BISECT)
+            return
+        self.type = types[0]
+        weights = set()
+        for atom in atoms.by_signature(solver.underscores + PREFERENCE, 5):
+            args = atom.symbol.arguments
+            if args[0] != name:
+                continue
+            if args[3].name == "for":
+                self.elements.setdefault(args[3].arguments[0], set()).add(
+                    args[4]
+                )
+            self.groups.add(solver.get(args[4], clingo.Number(0)))
+            weights.add(args[4])
+        # the value of the best weights is a lower bound
+        sign = 1 if self.type in [LESS_WEIGHT, MINMAX] else -1
+        self.lower = self.value(
+            [t for t in weights if sign * self.weight(t) < 0]
+        )
+        solver.control.add(
+            BISECT_PROGRAM, ["n", "b"],
+            BISECT_RULES.replace("##", solver.underscores)
+        )
+
+    def weight(self, t):
+        index = 0 if self.type in [LESS_WEIGHT, MORE_WEIGHT] else 1
+        weight = self.solver.get(t, clingo.Number(index))
+        if weight.type != clingo.SymbolType.Number:
+            return 0
+        return weight.number
+
+    def value(self, weights):
+        if self.type in [LESS_WEIGHT, MORE_WEIGHT]:
+            value = sum(self.weight(t) for t in weights)
+            return value if self.type == LESS_WEIGHT else -value
+        sums = dict((g, 0) for g in self.groups)
+        for t in weights:
+            sums[self.solver.get(t, clingo.Number(0))] += self.weight(t)
+        if not sums:
+            return 0
+        if self.type == MINMAX:
+            return max(sums.values())
+        return -min(sums.values())
+
+    def start_loop(self):
+        self.controller.start_loop()
+
+    def solve(self):
+        solver = self.solver
+        if self.type is None or solver.last_unsat:
+            self.controller.solve()
+            return
+        weights = set()
+        for atom in solver.holds:
+            weights.update(self.elements.get(atom, ()))
+        value = self.value(weights)
+        while True:
+            bound = (self.lower + value - 1) // 2
+            if bound >= value - 1: # the preference program requires it
+                self.controller.solve()
+                return
+            self.steps += 1
+            solver.ground([(BISECT_PROGRAM, [
+                clingo.Number(self.steps), clingo.Number(bound)
+            ])], solver)
+            external = clingo.Function(
+                solver.underscores + BISECT, [clingo.Number(self.steps)]
+            )
+            solver.control.assign_external(external, True)
+            try:
+                self.controller.solve()
+            finally:
+                solver.release_external(external)
+            if solver.solving_result != utils.UNSATISFIABLE:
+                if solver.solving_result == utils.SATISFIABLE:
+                    self.sat += 1
+                return
+            self.unsat_steps += 1
+            self.lower = bound + 1
+
+    # the value of an optimal model is a lower bound for the next ones
+    def unsat(self):
+        optimal = self.solver.solving_result == utils.UNSATISFIABLE
+        self.controller.unsat()
+        if self.type is not None and optimal:
+            weights = set()
+            for atom in self.solver.holds:
+                weights.update(self.elements.get(atom, ()))
+            self.lower = self.value(weights)
+
+    def print_stats(self, _file):
+        if self.steps:
+            self.solver.printer.do_print(STR_BISECT.format(
+                self.steps, self.sat, self.unsat_steps
+            ), file=_file)
+
+
 #
 # class OnOptimal
 #
@@ -466,13 +991,117 @@ class OnOptimalController:
         # assign externals
         if self.pref:
             solver.assign_heuristic_externals(
-                solver.get_holds_domain(),
-                set(solver.get_holds()),
+                solver.domain,
+                solver.domain.bitset(solver.get_holds()),
                 solver.underscores + LAST_HOLDS
             )
         if self.shown:
             solver.assign_heuristic_externals(
-                solver.get_shown_domain(),
-                set(solver.get_shown()),
+                solver.shown_index,
+                solver.shown_index.bitset(solver.get_shown()),
                 solver.underscores + LAST_SHOWN
             )
+
+
+#
+# Warm Start Controller (option --warm-start)
+#
+
+WARM_HOLDS = utils.WARM_HOLDS
+WARM_SHOWN = utils.WARM_SHOWN
+WARM_START = utils.WARM_START
+WARM_START_PROGRAM = utils.WARM_START_PROGRAM
+WARNING_WARM_START_BOUND = """WARNING: no holds atoms in the file of option \
+--warm-start, ignoring ',bound'"""
+
+# heuristic rules, while external WARM_START is true
+WARM_HEUR_RULES = """
+#heuristic {0} :     ##{1}({2}), ##""" + WARM_START + """. [1,sign]
+#heuristic {0} : not ##{1}({2}), ##""" + WARM_START + """. [-1,sign]
+"""
+
+class WarmStartController:
+
+    # option warm_start is None, or the atoms (strings) of a model, that are
+    # holds atoms if they are in the holds domain, and shown atoms otherwise,
+    # and option warm_start_holds has more holds atoms of the model:
+    # * in the first step, domain heuristics prefer the model, and then the
+    #   heuristics of the solvers are restored
+    # * with option warm_start_bound, the preference program is grounded
+    #   for the model (see Solver.ground_warm_start_bound), so that the first
+    #   step looks for a better model, and if there is none, the step is
+    #   solved again without the bound
+    def __init__(self, solver):
+        self.solver = solver
+        self.on = solver.options.warm_start is not None
+        self.bound = False
+        self.heuristics = []
+        if self.on:
+            solver.set_holds_domain = True
+
+    def start(self):
+        if not self.on:
+            return
+        solver = self.solver
+        # activate domain heuristic (after setting the portfolio)
+        for _solver in solver.control.configuration.solver:
+            self.heuristics.append(_solver.heuristic)
+            _solver.heuristic="Domain"
+        # holds and shown atoms
+        domain = set(solver.holds_domain)
+        holds = [clingo.parse_term(x) for x in solver.options.warm_start_holds]
+        shown = []
+        for atom in [clingo.parse_term(x) for x in solver.options.warm_start]:
+            if atom in domain:
+                holds.append(atom)
+            else:
+                shown.append(atom)
+        # heuristic program
+        program = "#external ##" + WARM_START + ".\n"
+        for atom in holds:
+            program += "##{}({}).\n".format(WARM_HOLDS, atom)
+        if holds:
+            program += WARM_HEUR_RULES.format(
+                "##" + HOLDS + "(X,0)", WARM_HOLDS, "X"
+            )
+        sigs = set()
+        for atom in shown:
+            program += "##{}({}).\n".format(WARM_SHOWN, atom)
+            sigs.add((atom.negative, atom.name, len(atom.arguments)))
+        for negative, name, arity in sorted(sigs):
+            atom = ("-" if negative else "") + name
+            if arity > 0:
+                variables = ",".join(["X" + str(i) for i in range(arity)])
+                atom += "(" + variables + ")"
+            program += WARM_HEUR_RULES.format(atom, WARM_SHOWN, atom)
+        program = program.replace("##", solver.underscores)
+        solver.add_and_ground(WARM_START_PROGRAM, [], program, [])
+        solver.control.assign_external(
+            clingo.Function(solver.underscores + WARM_START), True
+        )
+        # bound
+        if solver.options.warm_start_bound:
+            if not holds:
+                solver.printer.do_print(WARNING_WARM_START_BOUND)
+                return
+            solver.ground_warm_start_bound(holds)
+            self.bound = True
+
+    # solve again without the bound if there is no better model
+    def solve(self, method):
+        if not self.bound:
+            return
+        self.bound = False
+        self.solver.release_warm_start_bound()
+        if self.solver.solving_result == utils.UNSATISFIABLE:
+            method.solve()
+
+    def end_loop(self):
+        if self.on:
+            self.on = False
+            self.solver.release_external(
+                clingo.Function(self.solver.underscores + WARM_START)
+            )
+            solvers = self.solver.control.configuration.solver
+            for _solver, heuristic in zip(solvers, self.heuristics):
+                _solver.heuristic = heuristic
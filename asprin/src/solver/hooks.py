@@ -0,0 +1,166 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Hooks: user defined observers of the events of the solving loop
+#
+# A hook is an object of a subclass of Hook, added with Solver.add_hook()
+# (or Asprin.add_hook() before solving). Every event calls the method of the
+# same name of every hook, after the controllers have processed the event,
+# with a Context object with the following attributes:
+#   solver  : the Solver object
+#   event   : the name of the event
+#   step    : the current step
+#   time    : wall time (in seconds) since the start
+#   elapsed : wall time since the previous event (the time of this event)
+#   cpu     : cpu time since the previous event
+# Events that end asprin (like computing the last model) call only end().
+#
+
+import sys
+import time
+
+START      = "start"
+START_LOOP = "start_loop"
+SOLVE      = "solve"
+SAT        = "sat"
+UNSAT      = "unsat"
+UNKNOWN    = "unknown"
+END_LOOP   = "end_loop"
+END        = "end"
+EVENTS = [START, START_LOOP, SOLVE, SAT, UNSAT, UNKNOWN, END_LOOP, END]
+
+
+class Hook:
+
+    def start(self, context):
+        pass
+
+    def start_loop(self, context):
+        pass
+
+    def solve(self, context):
+        pass
+
+    def sat(self, context):
+        pass
+
+    def unsat(self, context):
+        pass
+
+    def unknown(self, context):
+        pass
+
+    def end_loop(self, context):
+        pass
+
+    def end(self, context):
+        pass
+
+
+class Context:
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.event = None
+        self.step = None
+        self.time = 0.0
+        self.elapsed = 0.0
+        self.cpu = 0.0
+
+
+class HookController:
+
+    def __init__(self, solver):
+        self.hooks = []
+        self.context = Context(solver)
+        self.start_wall = self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+
+    def add(self, hook):
+        self.hooks.append(hook)
+
+    def event(self, event):
+        if not self.hooks:
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        context = self.context
+        context.event = event
+        context.step = context.solver.step
+        context.time = wall - self.start_wall
+        context.elapsed = wall - self.wall
+        context.cpu = cpu - self.cpu
+        for hook in self.hooks:
+            getattr(hook, event)(context)
+        # do not count the time of the hooks
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+
+
+#
+# ProfilerHook (option --profile): histogram of the times of every event
+#
+
+# upper bounds of the buckets, in seconds
+BUCKETS = [0.001, 0.01, 0.1, 1, 10, float("inf")]
+BUCKETS_STR = ["<1ms", "<10ms", "<100ms", "<1s", "<10s", ">=10s"]
+PROFILE_HEAD = "{:<12}{:>8}{:>10}{:>10}" + "{:>8}" * len(BUCKETS)
+PROFILE_LINE = "{:<12}{:>8}{:>9.3f}s{:>9.3f}s" + "{:>8}" * len(BUCKETS)
+
+
+class ProfilerHook(Hook):
+
+    def __init__(self, _file=None):
+        self.file = _file
+        self.profile = dict(
+            (e, [0, 0.0, 0.0, [0] * len(BUCKETS)]) for e in EVENTS
+        )
+
+    def add(self, context):
+        # [calls, total, max, buckets]
+        entry, elapsed = self.profile[context.event], context.elapsed
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+        for i, bound in enumerate(BUCKETS):
+            if elapsed < bound:
+                entry[3][i] += 1
+                break
+
+    start = start_loop = solve = sat = unsat = unknown = end_loop = add
+
+    def end(self, context):
+        self.add(context)
+        self.print_profile()
+
+    def print_profile(self):
+        out = "\n" + PROFILE_HEAD.format(
+            "Profile", "Calls", "Total", "Max", *BUCKETS_STR
+        )
+        for event in EVENTS:
+            calls, total, _max, buckets = self.profile[event]
+            if calls:
+                out += "\n" + PROFILE_LINE.format(
+                    event, calls, total, _max, *buckets
+                )
+        print(out, file=self.file if self.file is not None else sys.stdout)
@@ -31,19 +31,12 @@ import sys
 import math
 from threading import Condition
 from . import controller
+from . import hooks
 from ..utils import printer
 from ..utils import utils
+from ..utils import tracer
 from .metasp import metasp
 
-# TIMING
-import time
-times = {}
-FREQUENCY = 1
-def start_clock(clock):
-    times[clock] = time.clock()
-def check_clock(clock):
-    return time.clock() - times[clock]
-
 
 #
 # DEFINES
@@ -59,7 +52,7 @@ UNKNOWN       = "UNKNOWN"
 END_LOOP      = "END_LOOP"
 END           = "END"
 SATISFIABLE   = utils.SATISFIABLE                   # used also by controller
-UNSATISFIABLE = "UNSATISFIABLE"
+UNSATISFIABLE = utils.UNSATISFIABLE                 # used also by controller
 
 # for meta-programming
 META_SIMPLE    = utils.META_SIMPLE
@@ -79,14 +72,14 @@ STR_MODEL_FOUND_STAR   = utils.STR_MODEL_FOUND_STAR # used also by controller
 STR_UNSATISFIABLE      = "UNSATISFIABLE"
 STR_SATISFIABLE        = "SATISFIABLE"
 STR_LIMIT              = "MODEL FOUND (SEARCH LIMIT)"
-STR_BENCHMARK_CLOCK    = "BENCHMARK"
-STR_BENCHMARK_FILE     = "benchmark.txt"
 
 # program names
 DO_HOLDS = "do_holds"
 DO_HOLDS_APPROX = "do_holds_approx"
 DO_HOLDS_DELETE_BETTER = "do_holds_delete_better"
 DO_HOLDS_AT_ZERO = "do_holds_at_zero"
+DO_HOLDS_RESUMED = "do_holds_resumed"
+DELETE_RESUMED_MODEL = "delete_resumed_model"
 OPEN_HOLDS = "open_holds"
 VOLATILE_FACT = "volatile_fact"
 VOLATILE_EXT = "volatile_external"
@@ -114,6 +107,7 @@ HOLDS_AT_ZERO = utils.HOLDS_AT_ZERO
 CSP           = "$"
 MODEL_DELETE_BETTER = clingo.parse_term("delete_better")
 DELETE_MODEL_VOLATILE_ATOM = "delete_model_volatile_atom"
+WARM_STEP     = -2 # for --warm-start (-1 is used by --ground-once)
 
 # messages
 WRONG_APPEND = """\
@@ -128,7 +122,6 @@ STR_UNKNOWN_OPTIMAL = """\nINFO: The following MODEL(S) FOUND (with SEARCH LIMIT
 are OPTIMAL MODEL(S): {}"""
 STR_UNKNOWN_NONOPTIMAL = """\nINFO: All MODEL(S) FOUND (with SEARCH LIMIT) \
 *could* be OPTIMAL MODEL(S): {}"""
-STR_BENCHMARK_MSG = """Solving Time {}: {:.2f}s"""
 
 #
 # AUXILIARY PROGRAMS
@@ -140,6 +133,8 @@ PROGRAMS = \
 #show ##holds_at_zero(X) : ##""" + HOLDS + """(X,0)."""),
    (DO_HOLDS,            ["m"],"""
 ##""" + HOLDS + """(X,m) :- X = @get_holds()."""),
+   (DO_HOLDS_RESUMED,    ["m"],"""
+##""" + HOLDS + """(X,m) :- X = @get_resumed_holds(m)."""),
    (OPEN_HOLDS,          ["m"],"""
 { ##""" + HOLDS + """(X,m) } :- X = @get_holds_domain()."""),
    (VOLATILE_FACT, ["m1","m2"],"""
@@ -149,6 +144,9 @@ PROGRAMS = \
    (DELETE_MODEL,           [],"""
 :-     ##""" + HOLDS + """(X,0) : X = @get_holds();
    not ##""" + HOLDS + """(X,0) : X = @get_nholds()."""),
+   (DELETE_RESUMED_MODEL,           ["m"],"""
+:-     ##""" + HOLDS + """(X,0) : X = @get_resumed_holds(m);
+   not ##""" + HOLDS + """(X,0) : X = @get_resumed_nholds(m)."""),
    (DELETE_MODEL_VOLATILE,           ["m"],"""
 #external ##""" + DELETE_MODEL_VOLATILE_ATOM + """(m).
 :-     ##""" + HOLDS + """(X,0) : X = @get_holds();
@@ -192,6 +190,33 @@ class Options:
 # Auxiliary methods
 #
 
+# returns a dictionary with the solver options of a clingo configuration
+solver_options = {}
+def get_solver_options(configuration):
+    if configuration not in solver_options:
+        control = clingo.Control(["--configuration=" + configuration])
+        solver = control.configuration.solver[0]
+        solver_options[configuration] = dict(
+            (key, getattr(solver, key)) for key in solver.keys
+        )
+    return solver_options[configuration]
+
+# returns a list with the solver options of every thread of a clingo
+# configuration with the given number of threads (and no other options)
+default_solver_options = {}
+def get_default_solver_options(configuration, threads):
+    if (configuration, threads) not in default_solver_options:
+        control = clingo.Control(
+            ["--configuration=" + configuration,
+             "--parallel-mode={}".format(threads)],
+            logger=lambda code, message: None
+        )
+        default_solver_options[(configuration, threads)] = [
+            dict((key, getattr(solver, key)) for key in solver.keys)
+            for solver in control.configuration.solver
+        ]
+    return default_solver_options[(configuration, threads)]
+
 def as_symbol(term: Union[int, str, clingo.Symbol]) -> clingo.Symbol:
     if isinstance(term, clingo.Symbol):
         return term
@@ -202,6 +227,198 @@ def as_symbol(term: Union[int, str, clingo.Symbol]) -> clingo.Symbol:
     else:
         raise TypeError(f'Type "{type(term).__name__}" could not be converted to Symbol.')
 
+#
+# HoldsDomain: maps the holds domain to dense integer ids,
+#              and represents the holds of a model as a bitset
+#              (a python integer whose bit i is set if atom i holds),
+#              that may be read from the literals of holds(X,0),
+#              kept in a dictionary from the terms X to the literals
+#              (it also maps the shown domain of option --on-opt-heur)
+#
+
+class HoldsDomain:
+
+    def __init__(self, symbols, literals=()):
+        self.symbols = symbols
+        self.literals = dict(zip(symbols, literals))
+        self.ids = dict((x, i) for i, x in enumerate(symbols))
+        self.nbytes = (len(symbols) + 7) // 8
+
+    def bitset(self, holds):
+        bits, ids = bytearray(self.nbytes), self.ids
+        for x in holds:
+            i = ids.get(x)
+            if i is not None:
+                bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, "little")
+
+    def model_bitset(self, model):
+        bits, is_true = bytearray(self.nbytes), model.is_true
+        for i, literal in enumerate(self.literals.values()):
+            if is_true(literal):
+                bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, "little")
+
+    # returns the symbols whose bit is equal to value
+    def select(self, bitset, value):
+        out, symbols, size = [], self.symbols, len(self.symbols)
+        none, full = (0, 0xFF) if value else (0xFF, 0)
+        for j, byte in enumerate(bitset.to_bytes(self.nbytes, "little")):
+            if byte == none:
+                continue
+            i = j << 3
+            if byte == full:
+                out.extend(symbols[i:i+8])
+                continue
+            for k in range(min(8, size - i)):
+                if (byte >> k) & 1 == value:
+                    out.append(symbols[i+k])
+        return out
+
+    def holds(self, bitset):
+        return self.select(bitset, 1)
+
+    def nholds(self, bitset):
+        return self.select(bitset, 0)
+
+#
+# SymbolFactory: the symbols created by the solver, built only once:
+#                holds(X,m) by step m, m(x), volatile(m(x),m(y)) and
+#                unsat(m(x),m(y)) by key (x,y), and name(X) by name,
+#                together with the solver literals of holds(X,m)
+#                (those of holds(X,0) are kept by the holds domain),
+#                where evict(x) drops the symbols of step x
+#
+
+class SymbolFactory:
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.holds_symbols = dict()   # step -> term -> holds(term,step)
+        self.model_symbols = dict()
+        self.volatile_symbols = dict()
+        self.unsat_symbols = dict()
+        self.name_symbols = dict()    # name -> term -> name(term)
+        self.holds_literals = dict()  # step -> term -> literal of holds
+
+    def holds(self, term, step):
+        symbols = self.holds_symbols.get(step)
+        if symbols is None:
+            symbols = self.holds_symbols[step] = dict()
+        symbol = symbols.get(term)
+        if symbol is None:
+            symbol = symbols[term] = clingo.Function(
+                self.solver.holds_str, [term, clingo.Number(step)]
+            )
+        return symbol
+
+    # returns the assumptions holds(X,step)=value for X in terms
+    # as solver literals, looking up each atom only once
+    # (atoms not yet grounded are not cached, and map to -1 like in clingo;
+    #  the literals of holds(X,0) are read from the holds domain, if any)
+    def holds_assumptions(self, terms, step, value):
+        domain, cache = self.solver.domain, True
+        if step == 0 and domain is not None:
+            literals, cache = domain.literals, False
+        else:
+            literals = self.holds_literals.get(step)
+            if literals is None:
+                literals = self.holds_literals[step] = dict()
+        sign = 1 if value else -1
+        out, atoms = [], None
+        for term in terms:
+            literal = literals.get(term)
+            if literal is None:
+                if atoms is None:
+                    atoms = self.solver.control.symbolic_atoms
+                atom = atoms[self.holds(term, step)]
+                if atom is None:
+                    out.append(-sign)
+                    continue
+                literal = atom.literal
+                if cache:
+                    literals[term] = literal
+            out.append(sign * literal)
+        return out
+
+    def model(self, x):
+        symbol = self.model_symbols.get(x)
+        if symbol is None:
+            symbol = self.model_symbols[x] = clingo.Function(
+                self.solver.model_str, [as_symbol(x)]
+            )
+        return symbol
+
+    def volatile(self, m1, m2):
+        key = (m1, m2)
+        symbol = self.volatile_symbols.get(key)
+        if symbol is None:
+            symbol = self.volatile_symbols[key] = clingo.Function(
+                self.solver.volatile_str, [self.model(m1), self.model(m2)]
+            )
+        return symbol
+
+    def unsat(self, m1, m2):
+        key = (m1, m2)
+        symbol = self.unsat_symbols.get(key)
+        if symbol is None:
+            symbol = self.unsat_symbols[key] = clingo.Function(
+                self.solver.unsat_str, [self.model(m1), self.model(m2)]
+            )
+        return symbol
+
+    def function(self, name, term):
+        symbols = self.name_symbols.get(name)
+        if symbols is None:
+            symbols = self.name_symbols[name] = dict()
+        symbol = symbols.get(term)
+        if symbol is None:
+            symbol = symbols[term] = clingo.Function(name, [as_symbol(term)])
+        return symbol
+
+    def forget_volatile(self, key):
+        self.volatile_symbols.pop(key, None)
+
+    def evict(self, step):
+        self.holds_symbols.pop(step, None)
+        self.holds_literals.pop(step, None)
+        self.model_symbols.pop(step, None)
+        for symbols in (self.volatile_symbols, self.unsat_symbols):
+            for key in [key for key in symbols if step in key]:
+                del symbols[key]
+
+#
+# ExternalManager: the volatile externals volatile(m(x),m(y)), by key (x,y),
+#                  with their assigned values (false by default),
+#                  so that only changes are assigned,
+#                  and released externals are evicted
+#
+
+class ExternalManager:
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.values = dict()
+        self.improving = []          # keys (0,y) of improving programs
+        self.not_improving = dict()  # keys of optimal models (ordered set)
+
+    def get(self, m1, m2):
+        return self.solver.symbol_factory.volatile(m1, m2)
+
+    def assign(self, key, value):
+        if self.values.get(key, False) != value:
+            self.solver.control.assign_external(self.get(*key), value)
+            self.values[key] = value
+
+    # for externals that keep their value from now on
+    def forget(self, key):
+        self.solver.symbol_factory.forget_volatile(key)
+        self.values.pop(key, None)
+
+    def release(self, key):
+        self.solver.release_external(self.get(*key))
+        self.forget(key)
+
 #
 # Solver
 #
@@ -227,6 +444,7 @@ class Solver:
         # holds
         self.holds             = []
         self.nholds            = []
+        self.holds_bitset      = None
         # others
         self.step = 1
         self.last_unsat = True
@@ -234,11 +452,13 @@ class Solver:
         self.models = 0
         self.more_models = True
         self.old_holds = None
+        self.old_shown_set = None
+        self.internal_names = {}
         self.shown = []
         self.solving_result = None
-        self.externals  = dict()
-        self.improving  = []
-        self.not_improving  = []
+        self.symbol_factory = SymbolFactory(self)
+        self.externals  = ExternalManager(self)
+        self.released_externals = 0
         self.store_holds = True
         self.store_nholds = False
         self.approx_opt_models = []
@@ -246,10 +466,12 @@ class Solver:
         self.last_model = None
         self.sequences = {}
         self.unknown = []
+        self.unknown_index = {}
         self.unknown_non_optimal = []
         self.grounded_delete_better = False
         self.mapping = {}
         self.unsat_program = PREFP
+        self.resumed = {}
         self.unsat_program_base = None
         # for weak mode
         self.control.configuration.solve.opt_mode = 'ignore' # by default ignore
@@ -258,8 +480,14 @@ class Solver:
         # holds and shown domains
         self.set_holds_domain = False
         self.holds_domain = []
+        self.domain = None
+        self.holds_by_literal = False
+        self.materialize_shown = True
         self.set_shown_domain = False
         self.shown_domain = []
+        self.shown_index = HoldsDomain([])
+        # --on-opt-heur: bitsets of the heuristic externals assigned to true
+        self.heuristic_bitsets = {}
         # exiting
         self.exited = False
         # functions
@@ -267,26 +495,49 @@ class Solver:
         # strings
         self.str_found      = STR_OPTIMUM_FOUND
         self.str_found_star = STR_OPTIMUM_FOUND_STAR
-        # printer
-        self.printer = printer.Printer()
+        # printer (model_printer receives the models, see JsonPrinter)
+        self.model_printer = None
+        if self.options.outf is not None:
+            self.model_printer = printer.JsonPrinter(
+                self.options.outf, self.options.outf_holds, self.symbol2str
+            )
+        self.printer = self.model_printer
+        if self.printer is None:
+            self.printer = printer.Printer()
         #if self.options.max_models == 1 and not self.options.improve_limit:
         #    self.store_nholds = False
-        self.saved_stats = False
-        if self.options.benchmark:
-            start_clock(STR_BENCHMARK_CLOCK)
-            with open(STR_BENCHMARK_FILE, 'w') as f:
-                f.write("")
+        self.clean_up_controller = None
+        self.time_limit_controller = None
+        self.checkpoint_controller = None
+        self.bisect_controller = None
+        # cubes: set by main.py in the main process (option --cubes),
+        #        and to the assumptions of the cube in its processes
+        self.cube_runner = None
+        self.cube_models = None
+        self.cube_assumptions = []
+        if self.options.cube is not None:
+            self.cube_models = []
+            self.cube_assumptions = [
+                (self.get_holds_function(clingo.parse_term(x), 0), value)
+                for x, value in self.options.cube
+            ]
+        # hooks
+        self.hooks = hooks.HookController(self)
+        if self.options.profile:
+            # with --outf, stdout has only JSON
+            _file = sys.stderr if self.options.outf is not None else None
+            self.add_hook(hooks.ProfilerHook(_file))
+        # tracer
+        self.tracer = None
+        if self.options.trace is not None:
+            self.tracer = tracer.Tracer(self.options.trace)
 
     #
     # AUXILIARY
     #
 
     def get_external(self, m1, m2):
-        if (m1, m2) not in self.externals:
-            f1 = clingo.Function(self.model_str, [as_symbol(m1)])
-            f2 = clingo.Function(self.model_str, [as_symbol(m2)])
-            self.externals[(m1, m2)] = clingo.Function(self.volatile_str, [f1, f2])
-        return self.externals[(m1, m2)]
+        return self.externals.get(m1, m2)
 
     def get_holds(self):
         return self.holds
@@ -295,24 +546,28 @@ class Solver:
         return self.holds_domain
 
     def do_set_holds_domain(self):
-        self.holds_domain = [
-            i.symbol.arguments[0] for i in
+        atoms = [
+            i for i in
                 self.control.symbolic_atoms.by_signature(self.holds_str, 2)
                 if str(i.symbol.arguments[1]) == "0"
         ]
+        self.holds_domain = [i.symbol.arguments[0] for i in atoms]
+        self.domain = HoldsDomain(self.holds_domain, [i.literal for i in atoms])
 
     def get_nholds(self):
         return self.nholds
 
+    def get_resumed_holds(self, step):
+        return self.domain.holds(self.resumed[step.number])
+
+    def get_resumed_nholds(self, step):
+        return self.domain.nholds(self.resumed[step.number])
+
     def get_holds_function(self, term, y):
-        return clingo.Function(self.holds_str, [term, clingo.Number(y)])
+        return self.symbol_factory.holds(term, y)
 
     def get_unsat_function(self, term, y):
-        return clingo.parse_term("{}({}{}({}),{}{}({}))".format(
-            self.unsat_str,
-            self.underscores, MODEL, str(term),
-            self.underscores, MODEL, y
-            ))
+        return self.symbol_factory.unsat(term, y)
 
     def cat(self, tuple):
         if tuple.arguments:
@@ -326,13 +581,6 @@ class Solver:
         else:
             return clingo.Function("", [elem] + [alist])
 
-    def save_stats(self):
-        if not self.saved_stats or check_clock(STR_BENCHMARK_CLOCK) > FREQUENCY:
-            self.saved_stats = True
-            with open(STR_BENCHMARK_FILE, 'w') as f:
-                self.print_stats(_file=f)
-            start_clock(STR_BENCHMARK_CLOCK)
-
 
     #
     # USED BY ASPRIN LIBRARY (to be copied at metasp/metasp.py)
@@ -379,7 +627,17 @@ class Solver:
     def add_encodings(self):
         for i in PROGRAMS:
             self.control.add(i[0], i[1], i[2].replace(TOKEN, self.underscores))
-        self.ground([(DO_HOLDS_AT_ZERO, [])], self)
+        # if the holds domain is known, the holds are read from its literals,
+        # else they are shown (meta-programming uses the shown holds)
+        self.holds_by_literal = self.domain is not None and \
+            self.options.meta not in (META_SIMPLE, META_COMBINE)
+        if not self.holds_by_literal:
+            self.ground([(DO_HOLDS_AT_ZERO, [])], self)
+        # with --quiet=2, the shown atoms are needed only to enumerate models
+        # (if no projection), and for --outf and --improve-limit
+        self.materialize_shown = self.options.quiet in (0, 1) or \
+            not self.options.project or self.model_printer is not None or \
+            self.options.improve_limit is not None or self.set_shown_domain
 
     def add_projection(self):
         self.ground([(PROJECT_CLINGO, [])], self)
@@ -406,18 +664,27 @@ class Solver:
         if error:
             raise Exception("parsing failed")
 
+    # with a holds domain, models are compared by their holds bitsets
     def check_last_model(self):
-        if self.old_holds  == self.holds:
+        holds = self.holds if self.domain is None else self.holds_bitset
+        if self.old_holds == holds:
             self.printer.do_print()
             raise Exception(SAME_MODEL)
-        self.old_holds  = self.holds
+        self.old_holds = holds
 
     def clean_up(self):
         self.control.cleanup()
 
+    def release_external(self, external):
+        self.control.release_external(external)
+        self.released_externals += 1
+
     def enumerate_on_model(self, model):
         true = model.symbols(shown=True)
-        self.shown = [i for i in true if i.name != self.holds_at_zero_str]
+        if self.holds_by_literal:
+            self.shown = true
+        else:
+            self.shown = [i for i in true if i.name != self.holds_at_zero_str]
         # we may enumerate one more model than what is needed,
         # so we check whether we already computed all models
         if self.options.max_models != 0 and \
@@ -443,10 +710,11 @@ class Solver:
         if solve_conf.models != "0" and add_one:
             solve_conf.models = str(int(solve_conf.models) + 1)
         # assumptions
-        ass  = [ (self.get_holds_function(x,0),  True) for x in self.holds ]
-        ass += [ (self.get_holds_function(x,0), False) for x in self.nholds]
+        ass  = self.symbol_factory.holds_assumptions(self.holds,  0, True)
+        ass += self.symbol_factory.holds_assumptions(self.nholds, 0, False)
         # solve
         self.old_shown, self.enumerate_flag = self.shown, False
+        self.old_shown_set = None
         self.solve(assumptions = ass + self.assumptions,
                    on_model = self.enumerate_on_model)
         self.shown = self.old_shown
@@ -473,7 +741,10 @@ class Solver:
         return self.shown_domain
 
     def ground(self, *args):
-        self.control_proxy.ground(*args)
+        if self.tracer is not None:
+            self.tracer.call(tracer.GROUND, self.control_proxy.ground, *args)
+        else:
+            self.control_proxy.ground(*args)
 
     def ground_cmd_heuristic(self):
         params = [clingo.parse_term(i) for i in self.options.cmd_heuristic]
@@ -494,14 +765,14 @@ class Solver:
         self.ground([(PBASE, [])], self)
 
     def ground_preference_program(self, volatile):
-        control, prev_step = self.control, self.step-1
+        prev_step = self.step-1
         parts = self.get_preference_parts(0, prev_step, True, volatile)
-        control.ground(parts, self)
+        self.ground(parts, self)
         if volatile:
             if self.options.release_last:
                 self.relax_previous_models()
-            control.assign_external(self.get_external(0,prev_step), True)
-            self.improving.append(prev_step)
+            self.externals.assign((0, prev_step), True)
+            self.externals.improving.append(prev_step)
 
     def ground_unsatp_base(self):
         self.ground([(self.unsat_program_base, [])], self)
@@ -523,15 +794,41 @@ class Solver:
         if volatile:
             self.handle_volatile_optimal_model(step, delete_worse, delete_better)
 
+    # for --resume: ground at once the optimal models given as (step, bitset)
+    def handle_optimal_models(self, models, delete_worse, delete_better,
+                              volatile):
+        parts = []
+        for step, bitset in models:
+            number = clingo.Number(step)
+            self.resumed[step] = bitset
+            parts.append((DO_HOLDS_RESUMED, [number]))
+            parts.append((DELETE_RESUMED_MODEL, [number]))
+            if delete_worse:
+                parts += self.get_preference_parts(step, 0, False, volatile)
+            if delete_better:
+                parts += self.get_preference_parts(
+                    MODEL_DELETE_BETTER, step, False, volatile
+                )
+        self.ground(parts, self)
+        self.resumed = {}
+        if volatile:
+            for step, bitset in models:
+                self.handle_volatile_optimal_model(
+                    step, delete_worse, delete_better
+                )
+
     def handle_volatile_optimal_model(self, step, delete_worse, delete_better):
+        externals, not_improving = self.externals, self.externals.not_improving
         if delete_worse:
-            self.not_improving.append((step,0))
+            not_improving[(step,0)] = True
         if delete_better:
-            self.not_improving.append((MODEL_DELETE_BETTER,step))
-        for x,y in self.not_improving:        #activate
-            self.control.assign_external(self.get_external(x,y),True)
+            not_improving[(MODEL_DELETE_BETTER,step)] = True
+        for key in not_improving:            #activate
+            externals.assign(key, True)
         if not self.options.no_opt_improving: #reset
-            self.not_improving = []
+            for key in not_improving:
+                externals.forget(key)
+            not_improving.clear()
 
     def no_optimize(self):
         optimize = self.underscores + utils.OPTIMIZE
@@ -543,15 +840,24 @@ class Solver:
         self.holds, self.nholds, self.shown = [], [], []
         if self.set_shown_domain:
             self.shown_domain_set(model)
+        if self.holds_by_literal:
+            self.holds_bitset = self.domain.model_bitset(model)
+            if self.store_holds:
+                self.holds = self.domain.holds(self.holds_bitset)
+            if self.store_nholds:
+                self.nholds = self.domain.nholds(self.holds_bitset)
+            if self.materialize_shown:
+                self.shown = model.symbols(shown=True)
+            return
         for a in model.symbols(shown=True):
             if a.name != self.holds_at_zero_str:
                 self.shown.append(a)
             elif self.store_holds:
                 self.holds.append(a.arguments[0])
-        if self.store_nholds:
-            self.nholds = [
-                x for x in self.holds_domain if x not in set(self.holds)
-            ]
+        if self.domain is not None:
+            self.holds_bitset = self.domain.bitset(self.holds)
+            if self.store_nholds:
+                self.nholds = self.domain.nholds(self.holds_bitset)
 
     def on_model_single(self, model):
         # call on_model
@@ -573,6 +879,21 @@ class Solver:
             self.iconfigs = 0
         self.control.configuration.configuration = self.options.configs[self.iconfigs]
 
+    # option --portfolio: every solver thread runs one configuration,
+    # except for the solver options that were set explicitly (in the command
+    # line, or like the domain heuristic of --on-opt-heur)
+    def set_portfolio(self):
+        configs = self.options.configs
+        solvers = self.control.configuration.solver
+        defaults = get_default_solver_options(
+            self.control.configuration.configuration, len(solvers)
+        )
+        for i in range(len(solvers)):
+            options = get_solver_options(configs[i % len(configs)])
+            for key, value in options.items():
+                if getattr(solvers[i], key) == defaults[i][key]:
+                    setattr(solvers[i], key, value)
+
     def set_control_models(self):
         solve_conf = self.control.configuration.solve
         if self.options.max_models == 0:
@@ -611,26 +932,33 @@ class Solver:
             #name = ("-" if atom.negative else "") + atom.name
             #self.shown_domain.add((name, len(atom.arguments)))
 
+    # the shown elements that are atoms with the same truth value,
+    # found by looking up the shown symbols in the symbolic atoms
     def shown_domain_set(self, model):
         self.set_shown_domain = False
-        # gather all true and false atoms
-        tatoms = model.symbols(atoms=True)
-        fatoms = model.symbols(atoms=True, complement=True)
-        # add shown elements that are true and false atoms
-        for atom in model.symbols(shown=True):
-            if atom in tatoms:
-                self.shown_domain_append(atom)
-        for atom in model.symbols(shown=True, complement=True):
-            if atom in fatoms:
-                self.shown_domain_append(atom)
+        atoms, is_true = self.control.symbolic_atoms, model.is_true
+        for value in (True, False):
+            for atom in model.symbols(shown=True, complement=not value):
+                symbolic_atom = atoms[atom]
+                if symbolic_atom is not None and \
+                   is_true(symbolic_atom.literal) == value:
+                    self.shown_domain_append(atom)
+        self.shown_index = HoldsDomain(self.shown_domain)
 
     def solve(self, *args, **kwargs):
-        if self.options.configs is not None:
+        if self.options.configs is not None and not self.options.portfolio:
             self.set_config()
-        result = self.control_proxy.solve(*args, **kwargs)
+        if self.model_printer is not None:
+            self.model_printer.before_solve()
+        if self.cube_assumptions:
+            kwargs['assumptions'] = list(kwargs.get('assumptions', [])) + \
+                                    self.cube_assumptions
+        if self.tracer is not None:
+            result = self.tracer.solve(self.control_proxy.solve, *args, **kwargs)
+            self.tracer.add_statistics(self.control)
+        else:
+            result = self.control_proxy.solve(*args, **kwargs)
         self.set_solving_result(result)
-        if self.options.benchmark:
-            self.save_stats()
         return result
 
     def solve_heuristic(self):
@@ -655,6 +983,9 @@ class Solver:
         self.printer.do_print("Solving...")
         while True:
             result = self.solve(on_model=self.on_model_single)
+            # interrupted (see --time-limit)
+            if self.solving_result == UNKNOWN:
+                break
             # unsat
             if self.opt_models == 0:
                 self.print_unsat()
@@ -690,7 +1021,7 @@ class Solver:
         result = self.solve(on_model=self.on_model_single)
         if result.exhausted:
             self.more_models = False
-        if self.opt_models == 0:
+        if self.opt_models == 0 and self.solving_result != UNKNOWN:
            self.print_unsat()
 
     def solve_unknown(self):
@@ -705,25 +1036,36 @@ class Solver:
         return str(symbol)
 
     def print_answer(self):
-        self.printer.do_print(STR_ANSWER.format(self.models))
-        self.printer.do_print(" ".join(map(self.symbol2str, self.shown)))
+        self.print_str_answer()
+        self.print_shown()
 
     def print_better_than_unknown(self, unknowns, mapping):
         self.print_unknowns(STR_BETTER_THAN_UNKNOWN, unknowns, mapping)
 
     def print_limit_string(self):
+        if self.model_printer is not None:
+            self.model_printer.optimality(STR_LIMIT)
         self.printer.do_print(STR_LIMIT)
 
     def print_no_optimize_warning(self):
         self.printer.print_warning(WARNING_NO_OPTIMIZE)
 
     def print_optimum_string(self, star=False):
-        if not star:
-            self.printer.do_print(self.str_found)
-        else:
-            self.printer.do_print(self.str_found_star)
+        if self.cube_models is not None:
+            self.cube_models.append((
+                [str(x) for x in self.holds],
+                [str(x) for x in self.shown],
+                star
+            ))
+        string = self.str_found if not star else self.str_found_star
+        if self.model_printer is not None:
+            self.model_printer.optimality(string)
+        self.printer.do_print(string)
 
     def print_shown(self):
+        if self.model_printer is not None:
+            self.model_printer.shown(self.shown, self.holds)
+            return
         self.printer.do_print(" ".join(map(self.symbol2str, self.shown)))
 
     def print_steps_message(self):
@@ -731,6 +1073,8 @@ class Solver:
             self.printer.do_print(STR_SATISFIABLE)
 
     def print_str_answer(self):
+        if self.model_printer is not None:
+            self.model_printer.answer(self.models, self.step)
         self.printer.do_print(STR_ANSWER.format(self.models))
 
     def print_unknowns(self, string, unknowns, mapping):
@@ -749,16 +1093,19 @@ class Solver:
         self.printer.do_print(STR_UNSATISFIABLE)
 
     def relax_previous_models(self):
-        for i in self.improving:
-            self.control.release_external(self.get_external(0, i))
-        self.improving = []
+        for i in self.externals.improving:
+            self.externals.release((0, i))
+        self.externals.improving = []
 
     def relax_optimal_models(self):
-        for x,y in self.not_improving:
-            self.control.assign_external(self.get_external(x,y),False)
+        for key in self.externals.not_improving:
+            self.externals.assign(key, False)
 
+    # the shown atoms of the model being enumerated are computed only once
     def same_shown(self):
-        if set(self.old_shown) == set(self.shown):
+        if self.old_shown_set is None:
+            self.old_shown_set = frozenset(self.old_shown)
+        if self.old_shown_set == frozenset(self.shown):
             self.enumerate_flag = True
             return True
         return False
@@ -766,11 +1113,24 @@ class Solver:
     def same_shown_false(self):
         return False
 
+    # the shown atoms that are not internal (whose name starts with the
+    # underscores), checking the names only once
+    def external_shown(self, shown):
+        u, internal, out = self.underscores, self.internal_names, []
+        for i in shown:
+            if i.type == clingo.SymbolType.Function and not i.negative:
+                value = internal.get(i.name)
+                if value is None:
+                    value = internal[i.name] = i.name.startswith(u)
+                if value:
+                    continue
+            out.append(i)
+        return frozenset(out)
+
     def same_shown_underscores(self):
-        u = self.underscores
-        s1 = set([i for i in self.old_shown if not str(i).startswith(u)])
-        s2 = set([i for i in     self.shown if not str(i).startswith(u)])
-        if s1 == s2:
+        if self.old_shown_set is None:
+            self.old_shown_set = self.external_shown(self.old_shown)
+        if self.old_shown_set == self.external_shown(self.shown):
             self.enumerate_flag = True
             return True
         return False
@@ -779,13 +1139,17 @@ class Solver:
     # on_opt_heur option
     #
 
-    def assign_heuristic_externals(self, domain, atoms, external_name):
-        for i in domain:
-            external = clingo.Function(external_name, [as_symbol(i)])
-            if i in atoms:
-                self.control.assign_external(external, True)
-            else:
-                self.control.assign_external(external, False)
+    # assigns the externals external_name(X) for X in domain to the bits of
+    # bitset, only for those that changed since the last assignment
+    # (initially, all externals are false)
+    def assign_heuristic_externals(self, domain, bitset, external_name):
+        old = self.heuristic_bitsets.get(external_name, 0)
+        self.heuristic_bitsets[external_name] = bitset
+        function = self.symbol_factory.function
+        for i in domain.holds(bitset & ~old):
+            self.control.assign_external(function(external_name, i), True)
+        for i in domain.holds(old & ~bitset):
+            self.control.assign_external(function(external_name, i), False)
 
     #
     # ground once method
@@ -797,16 +1161,17 @@ class Solver:
         self.ground(parts, self)
 
     def turn_off_preference_program(self):
-        self.control.assign_external(self.get_external(0,-1), False)
-        self.assumptions = (
-            [(self.get_holds_function(i,-1),False) for i in  self.holds_domain]
+        self.externals.assign((0, -1), False)
+        self.assumptions = self.symbol_factory.holds_assumptions(
+            self.holds_domain, -1, False
         )
 
     def turn_on_preference_program(self):
-        self.control.assign_external(self.get_external(0,-1), True)
+        self.externals.assign((0, -1), True)
+        factory = self.symbol_factory
         self.assumptions = (
-            [(self.get_holds_function(i,-1),True)  for i in  self.holds] +
-            [(self.get_holds_function(i,-1),False) for i in self.nholds]
+            factory.holds_assumptions(self.holds,  -1, True) +
+            factory.holds_assumptions(self.nholds, -1, False)
         )
 
     #
@@ -827,18 +1192,15 @@ class Solver:
         self.on_model(model)
         if self.options.quiet in {0,1}:
             self.print_shown()
-        self.approx_opt_models.append(self.holds)
+        self.approx_opt_models.append(self.holds_bitset)
         self.opt_models += 1
         self.print_optimum_string()
 
     def get_holds_approx(self, i):
-        return self.approx_opt_models[int(str(i))]
+        return self.domain.holds(self.approx_opt_models[i.number])
 
     def get_nholds_approx(self, i):
-        return [
-            x for x in self.holds_domain
-            if x not in set(self.approx_opt_models[int(str(i))])
-        ]
+        return self.domain.nholds(self.approx_opt_models[i.number])
 
     def solve_approx(self):
         # approximation programs
@@ -857,7 +1219,7 @@ class Solver:
         first = True
         while True:
             # solve
-            prev_opt_models, self.approx_opt_models = self.opt_models, [[]]
+            prev_opt_models, self.approx_opt_models = self.opt_models, [0]
             self.set_control_models()
             if on_on_optimal: # go one by one
                 self.control.configuration.solve.models = 1
@@ -890,12 +1252,84 @@ class Solver:
             self.ground(parts, self)
             # if on_optimal
         # end
-        if self.opt_models == 0:
+        unknown = self.solving_result == UNKNOWN # see --time-limit
+        if self.opt_models == 0 and not unknown:
             self.print_unsat()
-        self.more_models = True if satisfiable else False
+        self.more_models = True if satisfiable or unknown else False
         self.end()
 
 
+    #
+    # cubes (--cubes)
+    #
+
+    def get_cubes(self):
+        atoms = self.holds_domain[:self.options.cubes]
+        return [
+            [(str(x), (i >> j) & 1 == 1) for j, x in enumerate(atoms)]
+            for i in range(2 ** len(atoms))
+        ]
+
+    def is_optimal(self, holds):
+        # ground the preference program for holds, and check that
+        # there is no better model
+        step = self.step
+        self.holds = holds
+        self.ground_holds(step)
+        self.ground(self.get_preference_parts(0, step, True, True), self)
+        self.externals.assign((0, step), True)
+        self.solve(assumptions=[])
+        self.externals.release((0, step))
+        self.step += 1
+        return self.solving_result == UNSATISFIABLE
+
+    #
+    # warm start (--warm-start)
+    #
+
+    # ground the preference program for improving the model with holds,
+    # whose holds atoms are added at step WARM_STEP
+    def ground_warm_start_bound(self, holds):
+        self.holds = holds
+        self.ground_holds(WARM_STEP)
+        self.holds = []
+        self.ground(self.get_preference_parts(0, WARM_STEP, True, True), self)
+        self.externals.assign((0, WARM_STEP), True)
+
+    def release_warm_start_bound(self):
+        self.externals.release((0, WARM_STEP))
+
+    def solve_cubes(self):
+        self.printer.do_print("Solving...")
+        optimal = False
+        for models in self.cube_runner.run(self.get_cubes()):
+            # every model is either optimal in its cube, or it is
+            # enumerated (star) after the previous optimal model
+            for holds, shown, star in models:
+                holds = [clingo.parse_term(x) for x in holds]
+                if not star:
+                    optimal = self.is_optimal(holds)
+                if not optimal:
+                    continue
+                self.models += 1
+                self.opt_models += 1
+                self.print_str_answer()
+                if self.options.quiet in (0, 1):
+                    self.holds = holds
+                    self.shown = [clingo.parse_term(x) for x in shown]
+                    self.print_shown()
+                self.print_optimum_string(star)
+                if self.computed_all():
+                    break
+            if self.computed_all():
+                break
+        else:
+            self.more_models = False
+        if self.opt_models == 0:
+            self.print_unsat()
+        self.print_stats(solved=self.control_proxy.solved)
+        raise EndException
+
     #
     # unknown (--improve-limit)
     #
@@ -923,21 +1357,6 @@ class Solver:
             return
 
         # ELSE: print *shown* atoms
-        # create boolean array representing unknown
-        unknowns = [False] * (self.last_model + 1)
-        for i in self.unknown:
-            unknowns[i] = True
-        # create holds dictionary for unknowns
-        holds = {}
-        for i in self.control.symbolic_atoms.by_signature(self.holds_str, 2):
-            try:
-                step = int(i.symbol.arguments[1].number)
-                if unknowns[step]:
-                    alist = holds.setdefault(step, [])
-                    alist.append(i.symbol.arguments[0])
-            except:
-                pass
-
         # enumerate iterating over holds
         old = self.same_shown_function
         self.same_shown_function = self.same_shown_false
@@ -945,13 +1364,9 @@ class Solver:
             if self.computed_all():
                 return
             # pre
-            self.holds  = holds.get(step, [])
-            self.nholds = [
-                x for x in self.holds_domain if x not in set(self.holds)
-            ]
-            delete_model = clingo.parse_term(
-                "{}({})".format(self.delete_str, step)
-            )
+            bitset, delete_model, _ = self.unknown_index[step]
+            self.holds  = self.domain.holds(bitset)
+            self.nholds = self.domain.nholds(bitset)
             self.control.assign_external(delete_model, True)
             if self.options.project:
                 old = self.options.max_models
@@ -961,16 +1376,25 @@ class Solver:
             # post
             if self.options.project:
                 self.options.max_models = old
-            self.control.release_external(delete_model)
+            self.release_external(delete_model)
         self.same_shown_function = old
         self.more_models = False
 
     def on_model_unknown(self, model):
-        atoms = model.symbols(atoms=True)
         for i in self.unknown:
-            if not self.get_unsat_function(MODEL_DELETE_BETTER, i) in atoms:
+            if not model.contains(self.unknown_index[i][2]):
                 self.unknown_non_optimal.append(i)
 
+    # stores the holds bitset of the last model, that is unknown, with its
+    # delete model external and its unsat atom
+    def index_unknown(self):
+        step = self.last_model
+        self.unknown_index[step] = (
+            self.holds_bitset,
+            clingo.Function(self.delete_str, [clingo.Number(step)]),
+            self.get_unsat_function(MODEL_DELETE_BETTER, step)
+        )
+
     def handle_unknown_models(self, result):
 
         # if improve_no_check, add to unknown list if unknown
@@ -978,18 +1402,17 @@ class Solver:
             if result == UNKNOWN:
                 self.unknown.append(self.last_model)
                 self.mapping[self.last_model] = self.models
+                self.index_unknown()
             return
 
         # else check if some unknowns are worse than the latest model
         # assumptions
-        ass  = [ (self.get_holds_function(x,0),  True) for x in self.holds ]
-        ass += [ (self.get_holds_function(x,0), False) for x in self.nholds]
+        ass  = self.symbol_factory.holds_assumptions(self.holds,  0, True)
+        ass += self.symbol_factory.holds_assumptions(self.nholds, 0, False)
         ass += [                             (x, True) for x in self.shown]
         # turn unknowns on
         for i in self.unknown:
-            self.control.assign_external(
-                self.get_external(MODEL_DELETE_BETTER, i), True
-            )
+            self.externals.assign((MODEL_DELETE_BETTER, i), True)
         # solve
         self.unknown_non_optimal = []
         if self.unknown:
@@ -1000,34 +1423,30 @@ class Solver:
         # initialize array to update unknown
         update_unknown = [self.last_model] if result == UNKNOWN else []
         # release non optimal, and update unknown
+        unknown_non_optimal = set(self.unknown_non_optimal)
         for i in self.unknown:
-            if i in self.unknown_non_optimal:
-                self.control.release_external(
-                    self.get_external(MODEL_DELETE_BETTER, i)
-                )
-                self.control.release_external(
-                    self.get_external(i, 0)
-                )
+            if i in unknown_non_optimal:
+                self.externals.release((MODEL_DELETE_BETTER, i))
+                self.externals.release((i, 0))
                 del self.mapping[i]
+                del self.unknown_index[i]
+                self.symbol_factory.evict(i)
             else:
-                self.control.assign_external(
-                    self.get_external(MODEL_DELETE_BETTER, i), False
-                )
+                self.externals.assign((MODEL_DELETE_BETTER, i), False)
                 update_unknown.append(i)
         self.unknown = update_unknown
         # update not_improving
-        self.not_improving = [
-            x for x in self.not_improving
-            if x not in set([(y,0) for y in self.unknown_non_optimal])
-        ]
+        for i in unknown_non_optimal:
+            self.externals.not_improving.pop((i, 0), None)
         # if UNKNOWN, add delete better for last model (w/out unsat constraint)
         if result == UNKNOWN:
             x, y  = MODEL_DELETE_BETTER, clingo.Number(self.last_model)
             parts = [(self.unsat_program, [x, y]), (VOLATILE_EXT,  [x,y])]
             self.ground(parts, self)
             #self.control.ground(parts, self)
-            # also, add mapping
+            # also, add mapping and index
             self.mapping[self.last_model] = self.models
+            self.index_unknown()
         #
         # leftover from merge
         #
@@ -1090,6 +1509,14 @@ class Solver:
             self.options.non_optimal, self.options.stats,
             interrupted, solved, copy_statistics, _file
         )
+        if self.options.stats and self.clean_up_controller is not None:
+            self.clean_up_controller.print_stats(_file)
+        if self.time_limit_controller is not None:
+            self.time_limit_controller.print_stats(_file)
+        if self.checkpoint_controller is not None:
+            self.checkpoint_controller.print_stats(_file)
+        if self.bisect_controller is not None:
+            self.bisect_controller.print_stats(_file)
 
     def signal_on_solving(self):
         self.print_stats(interrupted=True)
@@ -1113,6 +1540,9 @@ class Solver:
         raise EndException
 
 
+    def add_hook(self, hook):
+        self.hooks.add(hook)
+
     #
     # run()
     #
@@ -1121,62 +1551,108 @@ class Solver:
 
         # controllers
         general = controller.GeneralController(self)
+        self.clean_up_controller = cleanup = controller.CleanUpController(self)
+        self.time_limit_controller = time_limit = \
+            controller.TimeLimitController(self)
         optimal = controller.GeneralControllerHandleOptimal(self)
         enumeration = controller.EnumerationController(self)
         self.on_optimal = on_optimal = controller.OnOptimalController(self)
+        warm_start = controller.WarmStartController(self)
+        self.checkpoint_controller = checkpoint = \
+            controller.CheckpointController(self, optimal)
         # MethodController
         if self.options.solving_mode == "weak":
             method = controller.ApproxMethodController(self)
             self.on_optimal = on_optimal
+        elif self.options.solving_mode == "core":
+            method = controller.CoreMethodController(self)
         elif self.options.solving_mode == "heuristic":
             method = controller.HeurMethodController(self)
         elif self.options.meta in [META_SIMPLE]:
             method = controller.MetaMethodController(self)
+        elif self.options.cubes:
+            method = controller.CubeMethodController(self)
         else:
             if self.options.ground_once:
                 method = controller.GroundOnceMethodController(self)
+            elif self.options.ground_adaptive:
+                method = controller.AdaptiveMethodController(self)
             else:
                 method = controller.GroundManyMethodController(self)
+        if self.options.bisect:
+            self.bisect_controller = method = \
+                controller.BisectController(self, method)
         if self.options.improve_limit is not None:
             method = controller.ImproveLimitController(self, method)
 
         # loop
         try:
             # START
+            time_limit.start()
             general.start()
+            warm_start.start()
             optimal.start()
+            checkpoint.start()
             method.start() # Approx and Meta finish here
+            self.hooks.event(hooks.START)
             self.printer.do_print("Solving...")
             while True:
                 # START_LOOP
+                if self.tracer is not None:
+                    self.tracer.start_step()
+                time_limit.start_loop()
                 method.start_loop()
+                self.hooks.event(hooks.START_LOOP)
                 # SOLVE
                 method.solve()
+                warm_start.solve(method)
+                if self.tracer is not None:
+                    self.tracer.result = self.solving_result
+                self.hooks.event(hooks.SOLVE)
                 if self.solving_result == SATISFIABLE:
                     # SAT
                     general.sat()
                     optimal.sat()
+                    self.hooks.event(hooks.SAT)
                 elif self.solving_result == UNSATISFIABLE:
                     # UNSAT
+                    checkpoint.unsat()
                     general.unsat()
                     method.unsat()
                     enumeration.unsat()
                     optimal.unsat()
                     on_optimal.unsat()
+                    self.hooks.event(hooks.UNSAT)
                 elif self.solving_result == UNKNOWN:
                     # UNKNOWN
+                    time_limit.unknown()
                     general.unknown()
                     method.unsat()
                     optimal.unknown()
                     on_optimal.unsat()
+                    self.hooks.event(hooks.UNKNOWN)
                 # END_LOOP
+                if self.tracer is not None:
+                    self.tracer.end_step(self)
                 general.end_loop()
+                cleanup.end_loop()
+                time_limit.end_loop()
+                warm_start.end_loop()
+                checkpoint.end_loop()
+                self.hooks.event(hooks.END_LOOP)
         except RuntimeError as e:
             if not self.exited:
                 self.printer.print_error("ERROR (clingo): {}".format(e))
             sys.exit(1)
         except EndException as e:
             # END
-            pass
+            if self.tracer is not None:
+                self.tracer.end_step(self)
+            self.hooks.event(hooks.END)
+        finally:
+            time_limit.end()
+            checkpoint.end()
+            if self.tracer is not None:
+                self.tracer.close()
 
 
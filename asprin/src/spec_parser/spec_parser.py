@@ -69,6 +69,7 @@ CODE         = "CODE"
 PREFERENCE   = "PREFERENCE"
 OPTIMIZE     = "OPTIMIZE"
 STDIN        = "-"
+STRING       = "<string>"
 END          = "end."
 CLINGOPATH   = "CLINGOPATH"
 ASPRIN_LIB   = "asprin_lib.lp"
@@ -236,7 +237,7 @@ class Parser(object):
         return self.programs, underscores
 
 
-    def __parse_file(self, filename):
+    def __parse_file(self, filename, string=None):
         # set variables
         self.filename = filename
         self.program  = BASE
@@ -247,9 +248,11 @@ class Parser(object):
         # prepare lexer
         self.lexer.new_file(filename)
         # handle file descriptor, and parse
-        fd = sys.stdin if filename == STDIN else open(filename)
-        self.parser.parse(fd.read(), self.lexer.lexer) # parses into self.list
-        fd.close()
+        if string is None:
+            fd = sys.stdin if filename == STDIN else open(filename)
+            string = fd.read()
+            fd.close()
+        self.parser.parse(string, self.lexer.lexer) # parses into self.list
 
 
     def __search_in_clingopath(self, file):
@@ -291,6 +294,10 @@ class Parser(object):
     #
     def parse_files(self):
 
+        # reset the class variables of previous parsings
+        ast.Statement.domains = set()
+        ast.PStatement.bfs = False
+
         # input files
         files = self.options['files']
         for i in files:
@@ -299,6 +306,10 @@ class Parser(object):
             else:
                 self.__parse_file(i[0])
 
+        # input strings
+        for i in self.options['strings']:
+            self.__parse_file(STRING, i)
+
         # included files
         self.__parse_included_files(files)
 
@@ -0,0 +1,119 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Runs the Python API of asprin with the mode and the file given as arguments,
+# and prints every model followed by its optimality, and the line
+# 'stats(<optimum>,<optimal>)' followed by 'OPTIMUM FOUND', so that the tester
+# compares them as answers. The modes are:
+#   solve : asprin.solve() with models=0
+#   break : asprin.solve() with models=0, leaving the loop after one model
+#           (prints 'interrupted(<interrupted>)' instead of the stats line)
+#   error : asprin.solve() with an unknown keyword (prints 'error(<type>)')
+#   string: asprin.solve() with models='0' and quiet='1', that are converted
+#           as in the command line
+#   value : asprin.solve() with models='all' (prints 'error(<type>)')
+#   async : asprin.solve_async() with models=0
+#   cancel: asprin.solve_async() with models=0, cancelling the task that
+#           iterates over the handle after one model (prints 'cancelled' and
+#           'interrupted(<interrupted>)' instead of the stats line)
+
+from __future__ import print_function
+import os
+import sys
+import json
+import asyncio
+import argparse
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "..", ".."
+))
+import asprin
+
+def print_model(model):
+    print(model)
+    print(model.optimality)
+
+def print_stats(stats):
+    print("stats({},{})".format(json.dumps(stats["optimum"]), stats["optimal"]))
+    print("OPTIMUM FOUND")
+
+def print_interrupted(stats):
+    print("interrupted({})".format(json.dumps(stats["interrupted"])))
+    print("OPTIMUM FOUND")
+
+async def solve_async(_file):
+    async with asprin.solve_async([_file], models=0) as handle:
+        async for model in handle:
+            print_model(model)
+    print_stats(handle.statistics)
+
+async def cancel(_file):
+    handle, found = asprin.solve_async([_file], models=0), asyncio.Event()
+    async def iterate():
+        async with handle:
+            async for model in handle:
+                print_model(model)
+                found.set()
+                await asyncio.sleep(3600)
+    task = asyncio.ensure_future(iterate())
+    await found.wait()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        print("cancelled")
+        print("OPTIMUM FOUND")
+    print_interrupted(handle.statistics)
+
+mode, _file = sys.argv[1], sys.argv[2]
+if mode == "solve":
+    with asprin.solve([_file], models=0) as handle:
+        for model in handle:
+            print_model(model)
+    print_stats(handle.statistics)
+elif mode == "break":
+    with asprin.solve([_file], models=0) as handle:
+        for model in handle:
+            print_model(model)
+            break
+    print_interrupted(handle.statistics)
+elif mode == "error":
+    try:
+        asprin.solve([_file], no_such_option=0)
+    except argparse.ArgumentError:
+        print("error(argument)")
+        print("OPTIMUM FOUND")
+elif mode == "string":
+    with asprin.solve([_file], models="0", quiet="1") as handle:
+        for model in handle:
+            print_model(model)
+    print_stats(handle.statistics)
+elif mode == "value":
+    try:
+        asprin.solve([_file], models="all")
+    except argparse.ArgumentError:
+        print("error(argument)")
+        print("OPTIMUM FOUND")
+elif mode == "async":
+    asyncio.run(solve_async(_file))
+elif mode == "cancel":
+    asyncio.run(cancel(_file))
@@ -0,0 +1,40 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Reads the responses of option --server from the standard input, and prints
+# the output of each one followed by the line 'reply(<id>,<code>)' (with
+# 'failed' if there was an error) and by 'OPTIMUM FOUND', so that the tester
+# compares them as answers
+
+from __future__ import print_function
+import sys
+import json
+
+for line in sys.stdin:
+    response = json.loads(line)
+    print(response["output"], end="")
+    reply = "reply({},{})".format(json.dumps(response["id"]), response["code"])
+    if "error" in response:
+        reply += " failed"
+    print(reply)
+    print("OPTIMUM FOUND")
@@ -0,0 +1,55 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Parses the output of option --outf=json|jsonl (given as argument) from the
+# standard input, and prints the shown atoms of every model followed by its
+# optimality, and the line 'stats(<optimum>,<optimal>)' followed by
+# 'OPTIMUM FOUND', so that the tester compares them as answers
+
+from __future__ import print_function
+import sys
+import json
+
+text = sys.stdin.read()
+if sys.argv[1] == "json":
+    document = json.loads(text)
+    objects = document["models"] + [{"stats" : document["stats"]}]
+else:
+    objects = [json.loads(line) for line in text.splitlines()]
+
+# the keys of a model may come in many objects
+models, stats = {}, None
+for obj in objects:
+    if "stats" in obj:
+        stats = obj["stats"]
+    else:
+        models.setdefault((obj["step"], obj["model"]), {}).update(obj)
+
+for key in sorted(models):
+    model = models[key]
+    print(" ".join(model.get("shown", [])))
+    if model.get("optimality") is not None:
+        print(model["optimality"])
+print("stats({},{})".format(json.dumps(stats.get("optimum")),
+                            stats.get("optimal")))
+print("OPTIMUM FOUND")
@@ -0,0 +1,69 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Solves the program of the file given as argument with a ClingoSignalHandler,
+# grounds a new part, and sends itself a signal, so that the handler prints the
+# statistics of the last solve call (see ClingoSignalHandler.statistics). The
+# lines with the number of models and calls are printed followed by
+# 'OPTIMUM FOUND', so that the tester compares them as answers, and so is the
+# line 'time(ok)' if the total time of the summary is not that of an epoch
+
+from __future__ import print_function
+import os
+import re
+import sys
+import signal
+import clingo
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "..", ".."
+))
+from src.utils import clingo_signal_handler
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+control = clingo.Control(["--stats", "0"])
+control.load(sys.argv[1])
+handler = clingo_signal_handler.ClingoSignalHandler(control, "test")
+handler.ground([("base", [])])
+handler.solve()
+control.add("next", [], "b.")
+handler.ground([("next", [])])
+
+# interrupt
+stdout, sys.stdout = sys.stdout, StringIO()
+try:
+    os.kill(os.getpid(), signal.SIGINT)
+except SystemExit:
+    pass
+output, sys.stdout = sys.stdout.getvalue(), stdout
+
+for line in output.splitlines():
+    if re.match(r'(Models|Calls)\s*:', line):
+        print(" ".join(line.split()))
+        print("OPTIMUM FOUND")
+if handler.statistics['summary']['times']['total'] < 3600:
+    print("time(ok)")
+    print("OPTIMUM FOUND")
@@ -0,0 +1,56 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Runs asprin with the arguments given, and prints every model found with the
+# search limit as 'limit(<model>)', and the lines of the statistics about the
+# time limits as 'time_limit(<steps>)' and 'step_limits(<number>)', each one
+# followed by 'OPTIMUM FOUND', so that the tester compares them as answers
+
+from __future__ import print_function
+import os
+import re
+import sys
+import subprocess
+
+ASPRIN = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "..",
+    "asprin.py"
+)
+
+output = subprocess.check_output(
+    [sys.executable, ASPRIN] + sys.argv[1:], universal_newlines=True
+)
+last = ""
+for line in output.splitlines():
+    if line == "MODEL FOUND (SEARCH LIMIT)":
+        print("limit({})".format(last))
+        print("OPTIMUM FOUND")
+    match = re.match(r'Time limit +: reached \(Steps: (\d+)\)', line)
+    if match:
+        print("time_limit({})".format(match.group(1)))
+        print("OPTIMUM FOUND")
+    match = re.match(r'Step limits +: (\d+)', line)
+    if match:
+        print("step_limits({})".format(match.group(1)))
+        print("OPTIMUM FOUND")
+    last = line
@@ -35,6 +35,14 @@ OPTIONS = [
     [""],
     ["--delete-better"],
     ["--ground-once"],
+    ["--ground-adaptive"],
+    ["--clean-up=step"],
+    ["--clean-up=auto,1,10,100"],
+    ["--profile"],
+    ["--time-limit=3600 --step-time-limit=600"],
+    ["--warm-start=" + os.path.join(PATH, "solver", "solver", "test015.txt")],
+    ["--bisect"],
+    ["--cubes=2"],
     ["--release-last"],
     ["--no-opt-improving"],
     ["--volatile-improving"],
@@ -51,6 +59,7 @@ OPTIONS = [
      --const-nb approx_pareto=2 --const-nb approx_and=2"""],
     ["--improve-limit=0,5"],
     ["--improve-limit=1,all,100"],
+    ["--configs=tweety --configs=jumpy --portfolio"],
     ["--on-opt-heur=+,p,-1,sign --on-opt-heur=-,p,1,sign"],
     ["--on-opt-heur=+,s,1,true --on-opt-heur=-,s,1,false"],
     ["--meta=simple"],
@@ -70,6 +79,54 @@ EXCLUDE["--on-opt-heur=+,p,-1,sign --on-opt-heur=-,p,1,sign"] = [
     os.path.join(PATH, "program_parser", "basic", "test002.lp"), # uses --approximation=heuristic
 ]
 
+EXCLUDE["--warm-start=" + os.path.join(PATH, "solver", "solver", "test015.txt")] = [
+    os.path.join(PATH, "program_parser", "basic", "test001.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "program_parser", "basic", "test003.lp"), # uses --approximation=heuristic
+]
+
+EXCLUDE["--bisect"] = [
+    os.path.join(PATH, "asprin_lib", "test023.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "asprin_lib", "test025.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "asprin_lib", "test027.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "program_parser", "basic", "test001.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "program_parser", "basic", "test002.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "program_parser", "basic", "test003.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "solver", "solver", "test008.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test009.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test010.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test011.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test012.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test013.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test017.lp"),     # uses --solving-mode=core
+    os.path.join(PATH, "solver", "solver", "test022.lp"),     # uses --solving-mode=core
+]
+
+EXCLUDE["--cubes=2"] = [
+    os.path.join(PATH, "asprin_lib", "test022.lp"),           # too hard
+    os.path.join(PATH, "asprin_lib", "test023.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "asprin_lib", "test025.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "asprin_lib", "test027.lp"),           # uses --approximation=weak
+    os.path.join(PATH, "program_parser", "basic", "test001.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "program_parser", "basic", "test002.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "program_parser", "basic", "test003.lp"), # uses --approximation=heuristic
+    os.path.join(PATH, "solver", "solver", "test003.lp"),     # uses --non-optimal
+    os.path.join(PATH, "solver", "solver", "test004.lp"),     # uses --non-optimal
+    os.path.join(PATH, "solver", "solver", "test008.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test009.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test010.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test011.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test012.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test013.lp"),     # uses --approximation=weak
+    os.path.join(PATH, "solver", "solver", "test014.lp"),     # uses --warm-start with ',bound'
+    os.path.join(PATH, "solver", "solver", "test015.lp"),     # uses --warm-start with ',bound'
+    os.path.join(PATH, "solver", "solver", "test016.lp"),     # uses --resume
+    os.path.join(PATH, "solver", "solver", "test017.lp"),     # uses --solving-mode=core
+    os.path.join(PATH, "solver", "solver", "test022.lp"),     # uses --solving-mode=core
+    os.path.join(PATH, "solver", "solver", "test018.lp"),     # uses --bisect
+    os.path.join(PATH, "solver", "solver", "test029.lp"),     # uses --improve-limit
+    os.path.join(PATH, "solver", "solver", "test030.lp"),     # uses --improve-limit
+]
+
 EXCLUDE["--meta=simple"] = [
     os.path.join(PATH, "asprin_lib", "test022.lp"), # too hard
     os.path.join(PATH, "asprin_lib", "test023.lp"), # too hard
@@ -77,6 +134,7 @@ EXCLUDE["--meta=simple"] = [
     os.path.join(PATH, "asprin_lib", "test025.lp"), # too hard
     os.path.join(PATH, "solver", "solver", "test008.lp"), # too hard
     os.path.join(PATH, "solver", "solver", "test009.lp"), # too hard
+    os.path.join(PATH, "solver", "solver", "test024.lp"), # too hard
     os.path.join(PATH, "program_parser", "visitor", "test002.lp"), # no error with --meta
 ]
 EXCLUDE[    "--meta=combine"] = EXCLUDE["--meta=simple"]
@@ -92,6 +150,36 @@ EXCLUDE["--preference-unsat $asprin/mine/asprin_lib_unsat.lp"] = [
     os.path.join(PATH, "spec_parser", "spec_parser", "test026.lp"), # adds new preference programs
 ]
 
+EXCLUDE_SOLVING = [
+    os.path.join(PATH, "solver", "solver", "test014.lp"), # uses --warm-start with ',bound'
+    os.path.join(PATH, "solver", "solver", "test015.lp"), # uses --warm-start with ',bound'
+    os.path.join(PATH, "solver", "solver", "test016.lp"), # uses --resume
+    os.path.join(PATH, "solver", "solver", "test018.lp"), # uses --bisect
+]
+EXCLUDE_CUBES = [
+    os.path.join(PATH, "solver", "solver", "test019.lp"), # uses --cubes
+    os.path.join(PATH, "solver", "solver", "test020.lp"), # uses --cubes
+]
+EXCLUDE_HEURISTIC = [
+    os.path.join(PATH, "solver", "solver", "test021.lp"), # checks --on-opt-heur
+]
+for i in OPTIONS:
+    if "--approximation" in i[0] or "--meta=simple" in i[0]:
+        EXCLUDE[i[0]] = EXCLUDE.get(i[0], []) + EXCLUDE_SOLVING
+    if "--approximation" in i[0]:
+        EXCLUDE[i[0]] += [
+            os.path.join(PATH, "solver", "solver", "test017.lp"), # uses --solving-mode=core
+            os.path.join(PATH, "solver", "solver", "test022.lp"), # uses --solving-mode=core
+            os.path.join(PATH, "solver", "solver", "test024.lp"), # too hard
+        ]
+    if "--approximation" in i[0] or "--meta=simple" in i[0] or \
+       "--improve-limit" in i[0] or "--bisect" in i[0]:
+        EXCLUDE[i[0]] = EXCLUDE.get(i[0], []) + EXCLUDE_CUBES
+    if "--approximation" in i[0] or "--meta" in i[0] or \
+       "--improve-limit" in i[0] or "--ground-once" in i[0] or \
+       "--portfolio" in i[0]:
+        EXCLUDE[i[0]] = EXCLUDE.get(i[0], []) + EXCLUDE_HEURISTIC
+
 add_option = False
 # to add one option to all OPTIONS, uncomment the next line and set option below
 #add_option = True
@@ -0,0 +1,87 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+# Runs asprin with the arguments given and option --trace, and checks the
+# format of every line of the trace (see utils/tracer.py): it prints the line
+# 'format(ok)' if every line has the keys of the trace, with the steps in
+# order, the results of the solve calls, the number of models and optimal
+# models not decreasing, the [wall, cpu] times as two non negative numbers,
+# and the conflicts and choices as non negative integers, or 'format(<n>)'
+# for the first line <n> that fails, and then the line 'optimal(<n>)' with
+# the optimal models of the last step, each one followed by 'OPTIMUM FOUND',
+# so that the tester compares them as answers
+
+from __future__ import print_function
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+ASPRIN = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "..", "..", "..", "asprin.py"
+)
+KEYS    = ["step", "result", "models", "optimal", "holds", "total", "ground",
+           "solve", "callback", "conflicts", "choices"]
+TIMES   = ["total", "ground", "solve", "callback"]
+RESULTS = ["SATISFIABLE", "UNSATISFIABLE", "UNKNOWN"]
+
+def is_count(value, minimum=0):
+    return isinstance(value, int) and value >= minimum
+
+def check(step, last):
+    if sorted(step) != sorted(KEYS) or step["result"] not in RESULTS:
+        return False
+    if step["step"] != last["step"] + 1 or \
+       not is_count(step["models"], last["models"]) or \
+       not is_count(step["optimal"], last["optimal"]):
+        return False
+    for key in TIMES:
+        times = step[key]
+        if len(times) != 2 or \
+           not all(isinstance(i, float) and i >= 0 for i in times):
+            return False
+    return all(is_count(step[key]) for key in ["holds", "conflicts", "choices"])
+
+handle, name = tempfile.mkstemp()
+os.close(handle)
+try:
+    subprocess.check_output(
+        [sys.executable, ASPRIN, "--trace=" + name] + sys.argv[1:],
+        stderr=subprocess.STDOUT
+    )
+    with open(name) as _file:
+        steps = [json.loads(line) for line in _file]
+finally:
+    os.remove(name)
+
+result, last = "ok", {"step": 0, "models": 0, "optimal": 0}
+for i, step in enumerate(steps):
+    if not check(step, last):
+        result = i + 1
+        break
+    last = step
+print("format({})".format(result))
+print("OPTIMUM FOUND")
+print("optimal({})".format(last["optimal"]))
+print("OPTIMUM FOUND")
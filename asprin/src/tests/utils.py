@@ -47,6 +47,10 @@ class Test:
         for i in string.splitlines():
             if line == 1:
                 self.command = i[1:]
+                # helper scripts (python <script>) use the same interpreter
+                self.command = re.sub(r'(^\s*|\|\s*)python ',
+                                      lambda m: m.group(1) + PYTHON + " ",
+                                      self.command)
                 self.command = self.command.replace('asprin',
                                                     ASPRIN+' '.join(options),1)
             elif line == 2:
@@ -58,7 +62,8 @@ class Test:
                 self.error = True if match else False
             else:
                 match = re.match(r'%( )*((OPTIMUM)|(MODEL)) FOUND.*', i)
-                if match:
+                match_limit = re.match(r'%( )*MODEL FOUND \(.*', i)
+                if match and not match_limit:
                     answer = last[1:].split(' ')
                     answer.sort()
                     answer = " ".join(answer)
@@ -112,6 +117,10 @@ class Result(Test):
                 answer.sort()
                 answer = " ".join(answer)
                 self.answers.append(answer)
+            # INFO messages (on stderr) may come between a model and its
+            # optimality string (see --ground-adaptive)
+            if i.startswith("INFO:"):
+                continue
             line, last = line+1, i
         self.answers.sort()
         if self.satisfiable:   self.count += 1
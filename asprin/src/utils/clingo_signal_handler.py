@@ -1,10 +1,15 @@
 from __future__ import print_function
 import clingo
+import copy
 import threading
 import sys
 import signal
-import copy
 from . import clingo_stats
+try:
+    from clingo._internal import _c_call, _lib
+    from clingo.statistics import _statistics
+except ImportError: # clingo versions without the cffi bindings
+    _lib = None
 
 # defines
 INTERRUPT  = """*** Info : ({}): INTERRUPTED by signal!
@@ -35,6 +40,33 @@ Variables    : 0        (Eliminated:    0 Frozen:    0)
 Constraints  : 0        (Binary:   0.0% Ternary:   0.0% Other:   0.0%)i
 """
 
+# returns the part of the statistics of control at path (a list of keys), or
+# None if there is no such part: Control.statistics converts the whole tree
+# of statistics to a dictionary, while we convert only that part
+def get_statistics(control, path):
+    if _lib is None:
+        statistics = control.statistics
+        for key in path:
+            if key not in statistics:
+                return None
+            statistics = statistics[key]
+        return statistics
+    stats = _c_call(
+        "clingo_statistics_t*", _lib.clingo_control_statistics, control._rep
+    )
+    key = _c_call("uint64_t", _lib.clingo_statistics_root, stats)
+    for name in path:
+        name = name.encode()
+        if not _c_call(
+            "bool", _lib.clingo_statistics_map_has_subkey, stats, key, name
+        ):
+            return None
+        key = _c_call(
+            "uint64_t", _lib.clingo_statistics_map_at, stats, key, name
+        )
+    return _statistics(stats, key)
+
+
 class ClingoSignalHandler:
 
     def __init__(self, control,
@@ -43,10 +75,10 @@ class ClingoSignalHandler:
                  function_after_solving=None,
                  function_on_solving=None,
                  function_on_not_solving=None,
-                 function_on_not_solved=None
+                 function_on_not_solved=None,
+                 signals=True
                 ):
         # public
-        self.statistics = None
         self.function_after_solving = function_after_solving
         self.function_on_solving = function_on_solving
         self.function_on_not_solving = function_on_not_solving
@@ -66,11 +98,39 @@ class ClingoSignalHandler:
         if self.function_on_not_solved is None:
             self.function_on_not_solved = self.on_not_solved
         self.condition = threading.Condition()
+        self.lock = threading.Lock()
         self.solving = False
+        self.searching = False
+        self.grounded = False
         self.result = None
-        # signal handling
-        signal.signal(signal.SIGTERM, self.signal_handler)
-        signal.signal(signal.SIGINT, self.signal_handler)
+        self.time_out = False
+        self.summary = None
+        self.lp_step = None
+        # signal handling (only possible in the main thread)
+        if signals:
+            signal.signal(signal.SIGTERM, self.signal_handler)
+            signal.signal(signal.SIGINT, self.signal_handler)
+
+    #
+    # public: statistics of the last solve call (None if not solved)
+    #
+    # Grounding starts a new step, and resets the summary and the lpStep
+    # statistics of the last solve call: we keep a copy of them after solving
+    #
+
+    @property
+    def statistics(self):
+        if not self.solved:
+            return None
+        statistics = self.control.statistics
+        if self.grounded:
+            # clingo caches the dictionary, so we modify a copy
+            statistics = dict(statistics)
+            statistics['summary'] = self.summary
+            if self.lp_step is not None:
+                problem = statistics['problem'] = dict(statistics['problem'])
+                problem['lpStep'] = self.lp_step
+        return statistics
 
     #
     # private: printing funtions
@@ -90,10 +150,7 @@ class ClingoSignalHandler:
 
     def on_not_solving(self):
         print(INTERRUPT.format(self.name))
-        statistics = self.control.statistics
-        if self.statistics is not None:
-            statistics = self.statistics
-        self.do_print_stats(statistics)
+        self.do_print_stats(self.statistics)
         sys.exit(1)
 
     def on_not_solved(self):
@@ -116,8 +173,22 @@ class ClingoSignalHandler:
         else:
             self.function_on_not_solved()
 
+    # public
+    # interrupt the current solve call, and the next ones until time_out is
+    # set to False (used by the timers of the time limits)
+    # (clingo would keep the interrupt for the next solve call if not
+    # searching, so we only interrupt between the start of the solve call
+    # and its on_finish callback)
+    def interrupt(self):
+        with self.lock:
+            self.time_out = True
+            if self.searching:
+                self.control.interrupt()
+
     # private
     def stop(self, result):
+        with self.lock:
+            self.searching = False
         self.result = result
         # notify
         with self.condition:
@@ -126,9 +197,13 @@ class ClingoSignalHandler:
     # private
     def do_solve(self, control, *args, **kwargs):
         with self.condition:
+            with self.lock:
+                self.searching = control is self.control
             with control.solve(
                 async_=True, on_finish=self.stop, *args, **kwargs
             ) as handle:
+                if self.time_out:
+                    control.interrupt()
                 # In Python 2, Condition.wait() isn't interruptible when called without a timeout.
                 # In Python 3, infinite timeouts lead to overflow errors.
                 # To accomodate for both Python versions, a switch on the timeout is necessary.
@@ -139,8 +214,10 @@ class ClingoSignalHandler:
     # public
     def solve(self, *args, **kwargs):
         self.solving = True
+        self.grounded = False
         # self.control.solve(*args, **kwargs)
         self.do_solve(self.control, *args, **kwargs)
+        self.copy_statistics()
         self.solved = True
         self.solving = False
         if self.interrupted:
@@ -149,6 +226,14 @@ class ClingoSignalHandler:
             self.function_after_solving()
         return self.result
 
+    # private
+    # copy the statistics that grounding resets
+    def copy_statistics(self):
+        summary = get_statistics(self.control, ['summary'])
+        self.summary = copy.deepcopy(summary)
+        lp_step = get_statistics(self.control, ['problem', 'lpStep'])
+        self.lp_step = copy.deepcopy(lp_step)
+
     # public
     # asyncronous solve that can be interrupted (control object is a parameter)
     def single_solve(self, control, *args, **kwargs):
@@ -157,12 +242,8 @@ class ClingoSignalHandler:
 
     # public
     def ground(self, *args):
-        if self.solved:
-            self.statistics = copy.deepcopy(
-                self.control.statistics
-            )
+        self.grounded = True
         self.control.ground(*args)
-        self.statistics = None
 
 
 class Test:
@@ -26,6 +26,8 @@ from ..utils import clingo_stats
 from ..utils import utils
 from ..utils import clingo_signal_handler
 import sys
+import json
+import math
 
 BASE = utils.BASE
 WARNING_INCLUDED_FILE = "<cmd>: warning: already included file:\n  {}\n"
@@ -35,6 +37,9 @@ TOO_MANY = "too many messages."
 INTERRUPT = clingo_signal_handler.INTERRUPT.format("asprin")
 SUMMARY_STR = clingo_signal_handler.SUMMARY_STR
 STATS_STR = clingo_signal_handler.STATS_STR
+JSON_BUFFER = 1 << 16
+JSON  = "json"
+JSONL = "jsonl"
 
 class Printer:
 
@@ -105,6 +110,21 @@ class Printer:
     # stats
     #
 
+    def get_stats(self, ctl, models, more_models,
+                  opt_models, non_optimal, stats,
+                  interrupted, solved, copy_statistics):
+        out = {"models" : models, "more" : more_models}
+        if not non_optimal:
+            out["optimum"] = opt_models > 0
+            out["optimal"] = opt_models
+        out["interrupted"] = interrupted
+        if solved:
+            statistics = ctl.statistics
+            if copy_statistics is not None:
+                statistics = copy_statistics
+            out["clingo"] = statistics if stats else statistics["summary"]
+        return out
+
     def print_stats(self, ctl, models, more_models,
                     opt_models, non_optimal, stats,
                     interrupted, solved, copy_statistics, _file):
@@ -134,3 +154,129 @@ class Printer:
         # print
         print(out, file=_file if _file is not None else sys.stdout)
         sys.stdout.flush()
+
+
+#
+# JsonPrinter (option --outf=json|jsonl)
+#
+# Every model is written as an object with keys
+#   "model" (its number), "step", "shown" (list of atoms),
+#   "holds" (list of atoms, only with option --outf=<m>,holds),
+#   and "optimality" (OPTIMUM FOUND, OPTIMUM FOUND *, MODEL FOUND (SEARCH
+#   LIMIT)... or null if it is not known yet).
+# A model is written before the next solve call, so that it is not delayed
+#   until the optimality of the model is known. In that case, the missing keys
+#   are written later in another object with the same "model" and "step".
+# The last object has the key "stats" with the statistics.
+# With jsonl every object is in one line, with json they form the document
+#   {"models" : [ <models> ], "stats" : <stats>}.
+# The output is buffered, and flushed before every solve call (and at the end).
+#
+
+class JsonPrinter(Printer):
+
+    def __init__(self, mode, holds, symbol2str=str):
+        self.mode    = mode
+        self.holds   = holds
+        self.symbol2str = symbol2str
+        self.buffer  = []
+        self.size    = 0
+        self.model   = None
+        self.written = False
+        self.objects = 0
+        if mode == JSON:
+            self.buffer.append('{"models" : [')
+
+    # text output is not printed
+    def do_print(self, *args, **kwargs):
+        pass
+
+    def __write(self, string):
+        self.buffer.append(string)
+        self.size += len(string)
+        if self.size >= JSON_BUFFER:
+            self.flush()
+
+    def __write_object(self, obj):
+        if self.mode == JSONL:
+            self.__write(json.dumps(obj) + "\n")
+        else:
+            self.__write(("\n" if self.objects == 0 else ",\n") + \
+                         json.dumps(obj))
+        self.objects += 1
+
+    def flush(self):
+        if self.buffer:
+            sys.stdout.write("".join(self.buffer))
+            self.buffer, self.size = [], 0
+        sys.stdout.flush()
+
+    #
+    # models
+    #
+
+    def __new(self, number, step):
+        return {"model" : number, "step" : step}
+
+    def __write_model(self):
+        self.__write_object(self.model)
+        self.model = self.__new(self.model["model"], self.model["step"])
+        self.written = True
+
+    # write the model if it has something new
+    def __finish(self):
+        if self.model is not None and \
+           (len(self.model) > 2 or not self.written):
+            self.model.setdefault("optimality", None)
+            self.__write_model()
+
+    def answer(self, number, step):
+        self.__finish()
+        self.model, self.written = self.__new(number, step), False
+
+    def shown(self, shown, holds):
+        if self.model is not None:
+            self.model["shown"] = [self.symbol2str(x) for x in shown]
+            if self.holds:
+                self.model["holds"] = [str(x) for x in holds]
+
+    def optimality(self, string):
+        if self.model is not None:
+            self.model["optimality"] = string
+            self.__write_model()
+
+    # called before every solve call
+    def before_solve(self):
+        self.__finish()
+        self.flush()
+
+    #
+    # stats
+    #
+
+    # infinite costs are not valid JSON
+    def __finite(self, x):
+        if isinstance(x, dict):
+            return {key : self.__finite(value) for key, value in x.items()}
+        if isinstance(x, list):
+            return [self.__finite(value) for value in x]
+        if isinstance(x, float) and not math.isfinite(x):
+            return None
+        return x
+
+    def print_stats(self, ctl, models, more_models,
+                    opt_models, non_optimal, stats,
+                    interrupted, solved, copy_statistics, _file):
+        self.__finish()
+        self.model = None
+        out = self.__finite(self.get_stats(
+            ctl, models, more_models, opt_models, non_optimal, stats,
+            interrupted, solved, copy_statistics
+        ))
+        if self.mode == JSONL:
+            self.__write(json.dumps({"stats" : out}) + "\n")
+        else:
+            self.__write('\n],\n"stats" : ' + json.dumps(out) + "}\n")
+        self.flush()
+        if _file is not None:
+            print(json.dumps(out), file=_file)
@@ -0,0 +1,115 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Tracer (option --trace=<file>)
+#
+# Writes one JSON object per line for every step of the solving loop, with
+#   "step", "result" (of the solve call of the method controller), "models",
+#   "optimal" and "holds" (number of holds atoms of the last model),
+#   the [wall, cpu] times in seconds of the step ("total"), of grounding
+#   ("ground"), of solving without callbacks ("solve"), and of the model
+#   callbacks ("callback"), and the conflicts and choices of the step.
+# The first step includes the time before the solving loop.
+#
+
+import json
+import time
+from . import clingo_signal_handler
+
+BUFFER   = 1 << 16
+GROUND   = "ground"
+SOLVE    = "solve"
+CALLBACK = "callback"
+
+
+class Tracer:
+
+    def __init__(self, file_name):
+        self.file = open(file_name, "w", buffering=BUFFER)
+        self.open = False
+        self.reset()
+
+    def reset(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        self.times = {
+            GROUND : [0.0, 0.0], SOLVE : [0.0, 0.0], CALLBACK : [0.0, 0.0]
+        }
+        self.conflicts, self.choices = 0, 0
+        self.result = None
+
+    def start_step(self):
+        self.open = True
+
+    # call function and add its wall and cpu times to key
+    def call(self, key, function, *args, **kwargs):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            times = self.times[key]
+            times[0] += time.perf_counter() - wall
+            times[1] += time.process_time() - cpu
+
+    def callback(self, function):
+        return lambda model: self.call(CALLBACK, function, model)
+
+    def solve(self, function, *args, **kwargs):
+        if kwargs.get('on_model') is not None:
+            kwargs['on_model'] = self.callback(kwargs['on_model'])
+        result = self.call(SOLVE, function, *args, **kwargs)
+        return result
+
+    # reads only the counters of the trace (see get_statistics)
+    def add_statistics(self, control):
+        get = clingo_signal_handler.get_statistics
+        self.conflicts += int(get(control, ['solving', 'solvers', 'conflicts']))
+        self.choices   += int(get(control, ['solving', 'solvers', 'choices']))
+
+    def end_step(self, solver):
+        if not self.open:
+            return
+        self.open = False
+        wall = time.perf_counter() - self.wall
+        cpu  = time.process_time() - self.cpu
+        times = self.times
+        # the solving time includes the callbacks
+        for i in range(2):
+            times[SOLVE][i] -= times[CALLBACK][i]
+        step = {
+            "step"      : solver.step,
+            "result"    : self.result,
+            "models"    : solver.models,
+            "optimal"   : solver.opt_models,
+            "holds"     : len(solver.holds),
+            "total"     : [round(wall, 6), round(cpu, 6)],
+        }
+        for key in (GROUND, SOLVE, CALLBACK):
+            step[key] = [round(x, 6) for x in times[key]]
+        step["conflicts"] = self.conflicts
+        step["choices"]   = self.choices
+        self.file.write(json.dumps(step) + "\n")
+        self.reset()
+
+    def close(self):
+        self.file.close()
@@ -43,6 +43,8 @@ UNSATP     = "preference_unsat"
 UNSATPBASE = "preference_unsat_base"
 CONSTANTS_NB = "constants_nonbase"
 ON_OPT_HEUR_PROGRAM  = "on_opt_heuristic"
+WARM_START_PROGRAM   = "warm_start"
+BISECT_PROGRAM       = "bisect"
 METAPROGRAM = "metaprogram"
 METAUNSAT = "meta_unsat"
 METAUNSAT_BASE = "meta_unsat_base"
@@ -77,6 +79,10 @@ WARN_PRED  = "warning"
 SHOW       = "show"
 LAST_HOLDS = "last_holds"
 LAST_SHOWN = "last_shown"
+WARM_HOLDS = "warm_holds"
+WARM_SHOWN = "warm_shown"
+WARM_START = "warm_start"
+BISECT     = "bisect"
 HOLDS_AT_ZERO = "holds_at_zero"
 
 # translation tokens
@@ -132,6 +138,7 @@ META_COMBINE = 3
 STR_MODEL_FOUND        = "MODEL FOUND"
 STR_MODEL_FOUND_STAR   = "MODEL FOUND *"
 SATISFIABLE            = "SATISFIABLE"
+UNSATISFIABLE          = "UNSATISFIABLE"
 
 #
 # global variables